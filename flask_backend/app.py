@@ -2,6 +2,11 @@
 """
 Flask backend for AI Interview Application
 Main application entry point
+
+The app is built by create_app() so importing this module is cheap: route
+modules are imported when the app is created and the OpenAI SDK only when a
+client is first needed. The schema is managed with Flask-Migrate
+(`flask db upgrade`) rather than on every worker boot.
 """
 
 import os
@@ -13,50 +18,145 @@ from flask_migrate import Migrate
 
 # Import models and database
 from models.user import db
-from models import * # Ensure Interview model is imported
+from models import * # Ensure all models are registered with SQLAlchemy and Alembic
+from utils.json_provider import init_json_provider
+from utils.compression import init_compression
+from utils.tracing import init_tracing
+from utils.profiling import init_profiling
+from utils.tenant_clients import init_tenant_clients
+from utils.usage import init_usage
+
+# Extensions are bound to the app inside create_app()
+migrate = Migrate()
+jwt = JWTManager()
+
+def _env_flag(name, default=''):
+    """Reads a boolean environment variable"""
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes')
+
+def _configure(app):
+    """Apply configuration from environment variables"""
+    # Configure database
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URI', 'sqlite:///app.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    # Configure JWT
+    app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'dev-secret-key')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600  # 1 hour
+    app.config['JWT_REFRESH_TOKEN_EXPIRES'] = 2592000  # 30 days
+
+    # Registration checks the email domain with a DNS lookup unless disabled
+    app.config['EMAIL_CHECK_DELIVERABILITY'] = _env_flag('EMAIL_CHECK_DELIVERABILITY', 'true')
+
+    # Configure interview recording storage
+    app.config['RECORDING_STORAGE_BACKEND'] = os.environ.get('RECORDING_STORAGE_BACKEND', 'local') # 'local' or 'module.path:ClassName'
+    app.config['RECORDING_STORAGE_DIR'] = os.environ.get('RECORDING_STORAGE_DIR') # Defaults to instance/recordings
+    app.config['RECORDING_MAX_CHUNK_SIZE'] = int(os.environ.get('RECORDING_MAX_CHUNK_SIZE', 8 * 1024 * 1024))  # 8 MB
+    app.config['RECORDING_MAX_SIZE'] = int(os.environ.get('RECORDING_MAX_SIZE', 4 * 1024 * 1024 * 1024))  # 4 GB
+    app.config['USE_X_SENDFILE'] = _env_flag('USE_X_SENDFILE') # Let a front proxy serve files
+
+    # Response encoding: orjson for JSON, gzip/brotli above COMPRESS_MIN_SIZE bytes
+    app.config['USE_ORJSON'] = _env_flag('USE_ORJSON', 'true')
+    app.config['COMPRESS_RESPONSES'] = _env_flag('COMPRESS_RESPONSES', 'true')
+    app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    app.config['COMPRESS_LEVEL'] = int(os.environ.get('COMPRESS_LEVEL', 1)) # Low levels cost far less CPU for most of the size reduction
+
+    # Model routing rules (JSON file overriding utils.model_router.DEFAULT_ROUTING) and per-call log
+    app.config['MODEL_ROUTING_CONFIG'] = os.environ.get('MODEL_ROUTING_CONFIG')
+    app.config['MODEL_ROUTING_LOG'] = os.environ.get('MODEL_ROUTING_LOG') # JSON lines, one per routed call
+
+    # Tracing: spans are exported for sampled requests when a file or OTLP/HTTP endpoint is set
+    app.config['TRACE_SAMPLE_RATE'] = float(os.environ.get('TRACE_SAMPLE_RATE', 0.1))
+    app.config['TRACE_EXPORT_FILE'] = os.environ.get('TRACE_EXPORT_FILE') # OTLP/JSON lines
+    app.config['TRACE_OTLP_ENDPOINT'] = os.environ.get('TRACE_OTLP_ENDPOINT') # e.g. http://localhost:4318/v1/traces
+    app.config['TRACE_SERVICE_NAME'] = os.environ.get('TRACE_SERVICE_NAME', 'interview-backend')
 
-# Import modules
-from routes.transcription import transcription_routes
-from routes.response_generation import response_routes
-from routes.text_to_speech import tts_routes
-from routes.auth import auth_routes
-from routes.interview_processing import interview_processing_routes # New import
+    # Per-employer OpenAI keys: Fernet key(s) encrypting them at rest, and per-tenant limits per worker
+    app.config['TENANT_KEY_ENCRYPTION_KEY'] = os.environ.get('TENANT_KEY_ENCRYPTION_KEY') # Comma-separated, newest first
+    # A tenant may use at most threads - 1 of a worker's threads, so others always get one
+    app.config['WORKER_THREADS'] = int(os.environ.get('GUNICORN_THREADS', 4)) # Same setting as gunicorn.conf.py
+    app.config['TENANT_MAX_CONCURRENCY'] = int(os.environ.get('TENANT_MAX_CONCURRENCY', max(1, app.config['WORKER_THREADS'] // 2)))
+    app.config['TENANT_QUEUE_TIMEOUT_S'] = float(os.environ.get('TENANT_QUEUE_TIMEOUT_S', 0)) # 0 = 429 at once, never park a thread
+    app.config['TENANT_CLIENT_POOL_SIZE'] = int(os.environ.get('TENANT_CLIENT_POOL_SIZE', 64))
+    app.config['USAGE_FLUSH_INTERVAL_S'] = float(os.environ.get('USAGE_FLUSH_INTERVAL_S', 15))
 
-# Load environment variables from .env file (if available)
-load_dotenv()
+    # Admin diagnostics (/api/admin/*) are disabled unless ADMIN_TOKEN is set
+    app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN')
+    app.config['PROFILE_OUTPUT_DIR'] = os.environ.get('PROFILE_OUTPUT_DIR') # Defaults to instance/profiles
 
-# Initialize Flask app
-app = Flask(__name__)
+    # Only for throwaway local databases; real deployments run `flask db upgrade`
+    app.config['AUTO_CREATE_TABLES'] = _env_flag('AUTO_CREATE_TABLES')
 
-# Configure database
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URI', 'sqlite:///app.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+def _register_blueprints(app):
+    """Import route modules and register their blueprints"""
+    from routes.transcription import transcription_routes
+    from routes.response_generation import response_routes
+    from routes.text_to_speech import tts_routes
+    from routes.auth import auth_routes
+    from routes.interview_processing import interview_processing_routes
+    from routes.recordings import recording_routes
+    from routes.admin import admin_routes
 
-# Configure JWT
-app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'dev-secret-key')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600  # 1 hour
-app.config['JWT_REFRESH_TOKEN_EXPIRES'] = 2592000  # 30 days
+    app.register_blueprint(auth_routes)
+    app.register_blueprint(transcription_routes)
+    app.register_blueprint(response_routes)
+    app.register_blueprint(tts_routes)
+    app.register_blueprint(interview_processing_routes)
+    app.register_blueprint(recording_routes)
+    app.register_blueprint(admin_routes)
 
-# Initialize extensions
-db.init_app(app)
-migrate = Migrate(app, db) # Ensure Migrate is configured
-jwt = JWTManager(app)
+def _register_commands(app):
+    """Import CLI command groups and attach them to `flask`"""
+    # Importing the command modules registers their subcommands on the group
+    from commands import interviews_cli, rescore, turns
 
-# Configure CORS to allow requests from any origin during development
-CORS(app, resources={r"/api/*": {"origins": "*"}}) # Ensure your frontend origin is allowed in prod
+    app.cli.add_command(interviews_cli)
 
-# Register blueprints for different endpoint groups
-app.register_blueprint(auth_routes)
-app.register_blueprint(transcription_routes)
-app.register_blueprint(response_routes)
-app.register_blueprint(tts_routes)
-app.register_blueprint(interview_processing_routes) # Register new blueprint
+def _user_identity(identity):
+    """JWT subjects must be strings; user ids are stored as their string form"""
+    return str(identity)
 
-# Create tables on startup if they don't exist
-with app.app_context():
-    db.create_all()
+def create_app(config=None):
+    """
+    Application factory.
+    `config` is an optional mapping applied on top of the environment-based settings.
+    """
+    # Load environment variables from .env file (if available)
+    load_dotenv()
+
+    app = Flask(__name__)
+    _configure(app)
+    if config:
+        app.config.update(config)
+
+    init_json_provider(app)
+    init_compression(app)
+
+    # Initialize extensions
+    db.init_app(app)
+    migrate.init_app(app, db)
+    jwt.init_app(app)
+    jwt.user_identity_loader(_user_identity)
+
+    # Configure CORS to allow requests from any origin during development
+    CORS(app, resources={r"/api/*": {"origins": "*"}}) # Ensure your frontend origin is allowed in prod
+
+    init_tenant_clients(app)
+    init_usage(app)
+
+    _register_blueprints(app)
+    _register_commands(app)
+
+    # Tracing wraps the registered views, so it is set up after the blueprints
+    init_tracing(app)
+    init_profiling(app)
+
+    if app.config['AUTO_CREATE_TABLES']:
+        with app.app_context():
+            db.create_all()
+
+    return app
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port, debug=True)
-
+    create_app().run(host="0.0.0.0", port=port, debug=True)
@@ -0,0 +1,57 @@
+"""
+Compare two load test reports
+
+Exits with status 1 if any route's p95 latency grew, or its throughput fell,
+by more than the tolerance. Meant for CI: keep a baseline report from the
+main branch and compare each run against it.
+
+Usage (from flask_backend/):
+    python -m benchmarks.compare baseline.json current.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(baseline, current, tolerance):
+    """Returns a list of (route, metric, before, after, regressed) rows"""
+    rows = []
+    for route, before in baseline["routes"].items():
+        after = current["routes"].get(route)
+        if after is None:
+            rows.append((route, "missing", None, None, True))
+            continue
+        if before["p95_ms"] and after["p95_ms"] is not None:
+            regressed = after["p95_ms"] > before["p95_ms"] * (1 + tolerance)
+            rows.append((route, "p95_ms", before["p95_ms"], after["p95_ms"], regressed))
+        if before["rps"] and after["rps"] is not None:
+            regressed = after["rps"] < before["rps"] * (1 - tolerance)
+            rows.append((route, "rps", before["rps"], after["rps"], regressed))
+        if after["errors"] > before["errors"]:
+            rows.append((route, "errors", before["errors"], after["errors"], True))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative change, e.g. 0.2 for 20%%")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.tolerance)
+    for route, metric, before, after, regressed in rows:
+        flag = "REGRESSION" if regressed else "ok"
+        print(f"{route:<32}{metric:<9}{before!s:>10} -> {after!s:<10} {flag}")
+
+    sys.exit(1 if any(row[4] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
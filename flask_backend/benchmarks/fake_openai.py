@@ -0,0 +1,278 @@
+"""
+Local stand-in for the OpenAI API
+
+Serves the three endpoints the backend uses (chat completions, audio
+transcriptions and audio speech) with configurable latency, streaming and
+error injection, so load tests run offline and cost nothing. Point the backend
+at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 and any OPENAI_API_KEY.
+
+Usage (from flask_backend/):
+    python -m benchmarks.fake_openai --port 8089 --latency chat=600 --latency speech=300 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Route name used in --latency options, by request path
+ROUTES = {
+    "/v1/chat/completions": "chat",
+    "/v1/audio/transcriptions": "transcriptions",
+    "/v1/audio/speech": "speech",
+}
+
+CHAT_REPLY = (
+    "That's a helpful example. Could you walk me through how you measured the impact "
+    "of that change? Let's move on to the next question."
+)
+
+ANALYSIS_REPLY = json.dumps({
+    "language_score": {"score": 8, "justification": "Clear and fluent answers."},
+    "personality_score": {"score": 7, "justification": "Confident and professional."},
+    "accuracy_score": {"score": 7, "justification": "Relevant answers with concrete examples."},
+    "overall_summary": "A solid interview with clear, relevant answers.",
+})
+
+TRANSCRIPTION_REPLY = "I led the migration of our billing service and cut latency by forty percent."
+
+
+class FakeOpenAIConfig:
+    """Behaviour of the stand-in server"""
+
+    def __init__(self, latency_ms=None, default_latency_ms=0, jitter=0.1,
+                 error_rate=0.0, error_status=500, speech_bytes=48000, stream_chunks=8, seed=None):
+        self.latency_ms = latency_ms or {}
+        self.default_latency_ms = default_latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.speech_bytes = speech_bytes
+        self.stream_chunks = stream_chunks
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def latency_s(self, route):
+        """Latency for one call to `route`, with +/- jitter applied"""
+        base = self.latency_ms.get(route, self.default_latency_ms)
+        with self.lock:
+            factor = 1 + self.random.uniform(-self.jitter, self.jitter)
+        return max(base * factor, 0) / 1000
+
+    def should_fail(self):
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def count(self, route):
+        with self.lock:
+            self.counts[route] = self.counts.get(route, 0) + 1
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler; the server's `config` attribute holds a FakeOpenAIConfig"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY, Nagle's algorithm
+    # and delayed ACKs add ~40ms to every response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Keep load test output readable
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "counts": self.server.config.counts})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        config = self.server.config
+        route = ROUTES.get(self.path.split("?")[0])
+        body = self._read_body()
+        if route is None:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        config.count(route)
+        latency = config.latency_s(route)
+
+        if config.should_fail():
+            time.sleep(latency)
+            self._send_json(
+                config.error_status,
+                {"error": {"message": "Injected failure", "type": "server_error"}},
+                # Keep the SDK from backing off for long on injected 429s
+                headers={"Retry-After": "0"}
+            )
+            return
+
+        if route == "chat":
+            self._chat(json.loads(body or b"{}"), latency)
+        elif route == "transcriptions":
+            time.sleep(latency)
+            reply = {"text": TRANSCRIPTION_REPLY}
+            if b"verbose_json" in body:
+                # Rough duration from the upload size (about 16 kB per second of compressed audio)
+                reply.update(task="transcribe", language="english", duration=round(len(body) / 16000, 2), segments=[])
+            self._send_json(200, reply)
+        else:
+            time.sleep(latency)
+            audio = b"\xff\xf3" + bytes(max(config.speech_bytes - 2, 0))
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Content-Length", str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio)
+
+    def _chat(self, request_data, latency):
+        wants_json = (request_data.get("response_format") or {}).get("type") == "json_object"
+        content = ANALYSIS_REPLY if wants_json else CHAT_REPLY
+        model = request_data.get("model", "gpt-4o-mini")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in request_data.get("messages", [])) // 4
+        completion_tokens = len(content) // 4
+
+        if not request_data.get("stream"):
+            time.sleep(latency)
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+            return
+
+        # Server-sent events: spread the latency over the chunks like a real token stream
+        chunks = max(self.server.config.stream_chunks, 1)
+        step = -(-len(content) // chunks)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(content), step):
+            time.sleep(latency / chunks)
+            self._write_event({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None}],
+            })
+        self._write_event({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        })
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_event(self, payload):
+        self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_server(config, host="127.0.0.1", port=0):
+    """
+    Starts the stand-in server on a background thread.
+    Returns the server; its base URL is f"http://{host}:{server.server_port}/v1".
+    """
+    server = ThreadingHTTPServer((host, port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    server.config = config
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def parse_latency(values):
+    """Parses repeated ROUTE=MS options into a dict"""
+    latency = {}
+    for value in values or []:
+        route, _, ms = value.partition("=")
+        if route not in ROUTES.values() or not ms:
+            raise argparse.ArgumentTypeError(f"--latency must look like chat=600, got {value!r}")
+        latency[route] = float(ms)
+    return latency
+
+
+def add_server_arguments(parser):
+    """Options shared by this script and the load generator"""
+    parser.add_argument("--latency", action="append", metavar="ROUTE=MS",
+                        help="latency per route (chat, transcriptions, speech); repeatable")
+    parser.add_argument("--default-latency", type=float, default=50, metavar="MS",
+                        help="latency for routes without --latency")
+    parser.add_argument("--jitter", type=float, default=0.1, help="relative latency jitter, e.g. 0.1 for +/-10%%")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected failures")
+    parser.add_argument("--speech-bytes", type=int, default=48000, help="size of generated speech audio")
+    parser.add_argument("--seed", type=int, help="random seed for jitter and error injection")
+
+
+def config_from_args(args):
+    return FakeOpenAIConfig(
+        latency_ms=parse_latency(args.latency),
+        default_latency_ms=args.default_latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        speech_bytes=args.speech_bytes,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    server.config = config_from_args(args)
+    print(f"Fake OpenAI API listening on http://{args.host}:{server.server_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
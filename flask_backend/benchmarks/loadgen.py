@@ -0,0 +1,319 @@
+"""
+Load generator for the interview backend
+
+Drives realistic interview sessions against the API: register and log in a
+candidate, then for every turn transcribe an answer, generate the interviewer's
+response and synthesize it to speech, and finally complete the interview. Each
+virtual user runs sessions back to back over its own keep-alive connection.
+
+By default the backend is started under gunicorn against a temporary SQLite
+database and the local OpenAI stand-in (benchmarks/fake_openai.py), so the run
+is fully offline. Pass --target to load an already running backend instead.
+
+The report (p50/p95/p99 latency and requests per second per route) is printed
+and, with --output, written as JSON for benchmarks/compare.py.
+
+Usage (from flask_backend/):
+    python -m benchmarks.loadgen --users 8 --sessions 40 --turns 3 --output load.json
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+from benchmarks.fake_openai import add_server_arguments, config_from_args, start_server
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ANSWERS = [
+    "In my last role I owned the payments API and reduced p95 latency from 800 to 300 milliseconds.",
+    "I prefer to start by reproducing the problem, then bisecting recent changes and adding a regression test.",
+    "We disagreed on the rollout plan, so I wrote up both options with their risks and we agreed on a canary.",
+    "I mentor two junior engineers and we pair on design reviews every week.",
+]
+
+QUESTIONS = [
+    "Tell me about a project you are proud of.",
+    "How do you approach debugging a production issue?",
+    "Describe a time you disagreed with a teammate.",
+    "How do you help others on your team grow?",
+]
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class Recorder:
+    """Collects per-route latencies from all virtual users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, route, elapsed_s, ok):
+        with self.lock:
+            self.samples.setdefault(route, []).append(elapsed_s)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def report(self, wall_time_s):
+        routes = {}
+        all_samples = []
+        for route, samples in sorted(self.samples.items()):
+            values = sorted(samples)
+            all_samples.extend(values)
+            routes[route] = self._stats(values, self.errors.get(route, 0), wall_time_s)
+        overall = self._stats(sorted(all_samples), sum(self.errors.values()), wall_time_s)
+        return {"routes": routes, "overall": overall}
+
+    @staticmethod
+    def _stats(values, errors, wall_time_s):
+        to_ms = lambda value: round(value * 1000, 2) if value is not None else None
+        return {
+            "count": len(values),
+            "errors": errors,
+            "rps": round(len(values) / wall_time_s, 2) if wall_time_s else None,
+            "p50_ms": to_ms(percentile(values, 50)),
+            "p95_ms": to_ms(percentile(values, 95)),
+            "p99_ms": to_ms(percentile(values, 99)),
+            "mean_ms": to_ms(sum(values) / len(values)) if values else None,
+            "max_ms": to_ms(values[-1]) if values else None,
+        }
+
+
+class ApiClient:
+    """Minimal JSON client over one keep-alive HTTP connection"""
+
+    def __init__(self, base_url, recorder, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.recorder = recorder
+        self.timeout = timeout
+        self.token = None
+        self.conn = None
+
+    def _connection(self):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self.conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def post(self, path, payload, route=None):
+        """POSTs JSON and records the latency under `route` (defaults to the path)"""
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        start = time.perf_counter()
+        try:
+            conn = self._connection()
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.close()
+            self.recorder.record(route or path, time.perf_counter() - start, False)
+            return None, None
+        self.recorder.record(route or path, time.perf_counter() - start, 200 <= status < 300)
+
+        try:
+            return status, json.loads(data) if data else None
+        except ValueError:
+            return status, None
+
+
+def run_session(client, rng, turns, audio_b64):
+    """One candidate's interview, start to finish"""
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    password = "load-test-password"
+    client.token = None
+
+    client.post("/api/auth/register/candidate", {
+        "email": email, "password": password, "first_name": "Load", "last_name": "Test",
+    })
+    status, data = client.post("/api/auth/login", {"email": email, "password": password})
+    if status != 200 or not data:
+        return
+    client.token = data.get("access_token")
+
+    transcript_lines = []
+    for turn in range(turns):
+        question = QUESTIONS[turn % len(QUESTIONS)]
+        transcript_lines.append(f"AI Interviewer: {question}")
+
+        status, data = client.post("/api/transcribe", {"audio_data": audio_b64, "options": {"language": "en"}})
+        answer = (data or {}).get("text") or rng.choice(ANSWERS)
+        transcript_lines.append(f"You: {answer}")
+
+        status, data = client.post("/api/generate-response", {
+            "transcript": answer, "currentQuestion": question,
+        })
+        reply = (data or {}).get("response") or "Let's move on to the next question."
+        transcript_lines.append(f"AI Interviewer: {reply}")
+
+        client.post("/api/text-to-speech", {"text": reply})
+
+    client.post("/api/interviews/complete", {
+        "transcript_text": "\n".join(transcript_lines),
+        "title": "Load test interview",
+    })
+
+
+def run_load(base_url, users, sessions, turns, audio_bytes, timeout, seed=None):
+    """Runs `sessions` interviews spread over `users` threads. Returns (recorder, wall time)."""
+    recorder = Recorder()
+    audio_b64 = base64.b64encode(os.urandom(audio_bytes)).decode("ascii")
+    remaining = iter(range(sessions))
+    remaining_lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(None if seed is None else seed + index)
+        client = ApiClient(base_url, recorder, timeout)
+        try:
+            while True:
+                with remaining_lock:
+                    if next(remaining, None) is None:
+                        return
+                run_session(client, rng, turns, audio_b64)
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - start
+
+
+def wait_for_backend(base_url, timeout_s=30):
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Backend at {base_url} did not become healthy")
+
+
+def spawn_backend(port, workers, fake_base_url, tmp_dir):
+    """Starts the backend under gunicorn against a scratch database and the stand-in API"""
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URI": f"sqlite:///{os.path.join(tmp_dir, 'load.db')}",
+        "AUTO_CREATE_TABLES": "true",
+        "RECORDING_STORAGE_DIR": os.path.join(tmp_dir, "recordings"),
+        "OPENAI_API_KEY": "sk-load-test",
+        "OPENAI_BASE_URL": fake_base_url,
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_PRELOAD": "true",
+        "JWT_SECRET_KEY": "load-test-secret-key-with-enough-bytes",
+        "EMAIL_CHECK_DELIVERABILITY": "false",
+    })
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def print_report(report):
+    print(f"{'route':<32}{'count':>7}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(report["routes"].items()) + [("overall", report["overall"])]
+    for route, stats in rows:
+        print(f"{route:<32}{stats['count']:>7}{stats['errors']:>6}{stats['rps']:>9}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="base URL of a running backend; omit to spawn one locally")
+    parser.add_argument("--users", type=int, default=4, help="concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=20, help="total interview sessions to run")
+    parser.add_argument("--turns", type=int, default=3, help="question/answer turns per session")
+    parser.add_argument("--audio-bytes", type=int, default=32000, help="size of the audio sent for transcription")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    parser.add_argument("--backend-port", type=int, default=5099, help="port for the spawned backend")
+    parser.add_argument("--backend-workers", type=int, default=2, help="gunicorn workers for the spawned backend")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    fake_server = None
+    backend = None
+    tmp = tempfile.TemporaryDirectory()
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+        else:
+            fake_server = start_server(config_from_args(args))
+            fake_base_url = f"http://127.0.0.1:{fake_server.server_port}/v1"
+            backend = spawn_backend(args.backend_port, args.backend_workers, fake_base_url, tmp.name)
+            base_url = f"http://127.0.0.1:{args.backend_port}"
+        wait_for_backend(base_url)
+
+        recorder, wall_time_s = run_load(
+            base_url, args.users, args.sessions, args.turns, args.audio_bytes, args.timeout, args.seed
+        )
+    finally:
+        if backend is not None:
+            backend.send_signal(signal.SIGTERM)
+            backend.wait(timeout=30)
+        if fake_server is not None:
+            fake_server.shutdown()
+        tmp.cleanup()
+
+    report = {
+        "benchmark": "load",
+        "target": args.target or "spawned",
+        "users": args.users,
+        "sessions": args.sessions,
+        "turns": args.turns,
+        "wall_time_s": round(wall_time_s, 3),
+        "fake_openai": None if args.target else {
+            "latency_ms": args.latency, "default_latency_ms": args.default_latency,
+            "error_rate": args.error_rate,
+        },
+        **recorder.report(wall_time_s),
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+API payload benchmark
+
+Measures CPU time per request and bytes on the wire for the interview list
+endpoint under different response settings: the stdlib JSON provider vs
+orjson, no compression vs gzip (and brotli if installed), and a conditional
+GET answered with 304. Runs in-process against a scratch SQLite database
+filled with interviews that carry realistic full transcripts.
+
+Usage (from flask_backend/):
+    python -m benchmarks.payloads --interviews 20 --requests 300 --output payloads.json
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+WORDS = (
+    "we the service latency team index query customer release incident rollback metrics "
+    "dashboard on-call tracing cache database migration deploy review design tradeoff owner "
+    "checkout payments timeout retry queue worker throughput budget roadmap stakeholder "
+    "feedback mentor pairing testing coverage regression alert postmortem schema api "
+    "because then after before while so and but with without across between during"
+).split()
+
+
+def make_transcript(rng, turns=40, words_per_answer=60):
+    """A transcript with varied wording, so compression ratios are realistic"""
+    lines = []
+    for turn in range(turns):
+        lines.append(f"AI Interviewer: Question {turn + 1}, tell me about {rng.choice(WORDS)} {rng.choice(WORDS)}.")
+        lines.append("You: " + " ".join(rng.choice(WORDS) for _ in range(words_per_answer)) + ".")
+    return "\n".join(lines)
+
+
+def build_app(db_path, config):
+    from app import create_app
+    return create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "JWT_SECRET_KEY": "payload-benchmark-secret-key-with-enough-bytes",
+        **config,
+    })
+
+
+def seed(app, interviews):
+    """Creates one candidate with `interviews` analysed interviews. Returns an access token."""
+    from flask_jwt_extended import create_access_token
+    from models import db, Candidate, Interview
+
+    rng = random.Random(42)
+    with app.app_context():
+        db.create_all()
+        candidate = Candidate(email="bench@example.com", first_name="Bench", last_name="Mark")
+        candidate.set_password("bench")
+        db.session.add(candidate)
+        db.session.flush()
+        for i in range(interviews):
+            db.session.add(Interview(
+                title=f"Practice interview {i}",
+                candidate_id=candidate.id,
+                status="completed",
+                transcript_text=make_transcript(rng),
+                language_score=8, personality_score=7, accuracy_score=7, score=7.3,
+                language_justification="Clear and fluent.",
+                personality_justification="Confident.",
+                accuracy_justification="Relevant examples.",
+                overall_summary="Solid answers with concrete examples.",
+            ))
+        db.session.commit()
+        return create_access_token(identity=candidate.id)
+
+
+def measure(client, token, requests, accept_encoding=None, conditional=False):
+    """CPU seconds and bytes per request for GET /api/interviews"""
+    headers = {"Authorization": f"Bearer {token}"}
+    if accept_encoding:
+        headers["Accept-Encoding"] = accept_encoding
+    if conditional:
+        etag = client.get("/api/interviews", headers=headers).headers["ETag"]
+        headers["If-None-Match"] = etag
+
+    total_bytes = 0
+    status = None
+    start = time.process_time()
+    for _ in range(requests):
+        response = client.get("/api/interviews", headers=headers)
+        total_bytes += len(response.get_data())
+        status = response.status_code
+    cpu = time.process_time() - start
+    return {
+        "status": status,
+        "cpu_ms_per_request": round(cpu / requests * 1000, 3),
+        "bytes_per_request": total_bytes // requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=20, help="interviews in the listed payload")
+    parser.add_argument("--requests", type=int, default=300, help="requests per scenario")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    from utils.compression import brotli
+
+    scenarios = [
+        ("stdlib json, identity", {"USE_ORJSON": False, "COMPRESS_RESPONSES": False}, None, False),
+        ("orjson, identity", {"USE_ORJSON": True, "COMPRESS_RESPONSES": False}, None, False),
+        ("orjson, gzip", {"USE_ORJSON": True}, "gzip", False),
+    ]
+    if brotli is not None:
+        scenarios.append(("orjson, br", {"USE_ORJSON": True}, "br, gzip", False))
+    scenarios.append(("orjson, 304 revalidation", {"USE_ORJSON": True}, "gzip", True))
+
+    results = {"benchmark": "payloads", "interviews": args.interviews, "requests": args.requests, "scenarios": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (name, config, accept_encoding, conditional) in enumerate(scenarios):
+            app = build_app(os.path.join(tmp, f"bench{index}.db"), config)
+            token = seed(app, args.interviews)
+            client = app.test_client()
+            results["scenarios"][name] = measure(client, token, args.requests, accept_encoding, conditional)
+
+    for name, stats in results["scenarios"].items():
+        print(f"{name:<28} status {stats['status']}  cpu {stats['cpu_ms_per_request']:>8.3f} ms  "
+              f"wire {stats['bytes_per_request']:>8} bytes")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
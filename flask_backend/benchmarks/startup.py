@@ -0,0 +1,102 @@
+"""
+Worker startup benchmark
+
+Measures, in fresh interpreter processes, how long it takes to import the app
+module, build the app with create_app(), and serve the first request. This is
+what a gunicorn worker pays on spawn when the app is not preloaded.
+
+Usage (from flask_backend/):
+    python -m benchmarks.startup --runs 10 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a child process; prints one JSON line with the phase timings
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+response = app.test_client().get(sys.argv[1])
+t3 = time.perf_counter()
+print(json.dumps({
+    "import_s": t1 - t0,
+    "create_app_s": t2 - t1,
+    "first_request_s": t3 - t2,
+    "time_to_first_request_s": t3 - t0,
+    "status": response.status_code,
+    "openai_imported": "openai" in sys.modules,
+}))
+"""
+
+PHASES = ["import_s", "create_app_s", "first_request_s", "time_to_first_request_s"]
+
+
+def run_probe(path, env):
+    """Runs the probe once in a new interpreter and returns its timings"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, path],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    """Median/min/max per phase, in milliseconds"""
+    summary = {}
+    for phase in PHASES:
+        values = [sample[phase] * 1000 for sample in samples]
+        summary[phase.replace("_s", "_ms")] = {
+            "median": round(statistics.median(values), 2),
+            "min": round(min(values), 2),
+            "max": round(max(values), 2),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh processes to time")
+    parser.add_argument("--path", default="/api/health", help="route used for the first request")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.setdefault("DATABASE_URI", f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        env.setdefault("RECORDING_STORAGE_DIR", os.path.join(tmp, "recordings"))
+
+        # Warm the OS file cache so the first sample is not an outlier
+        run_probe(args.path, env)
+        samples = [run_probe(args.path, env) for _ in range(args.runs)]
+
+    results = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "path": args.path,
+        "python": sys.version.split()[0],
+        "openai_imported_at_startup": any(sample["openai_imported"] for sample in samples),
+        "phases": summarize(samples),
+    }
+
+    for phase, stats in results["phases"].items():
+        print(f"{phase:<28} median {stats['median']:>9.2f}  min {stats['min']:>9.2f}  max {stats['max']:>9.2f}")
+    print(f"openai imported at startup: {results['openai_imported_at_startup']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
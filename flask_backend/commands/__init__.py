@@ -0,0 +1,4 @@
+# CLI commands package
+from flask.cli import AppGroup
+
+interviews_cli = AppGroup('interviews', help='Bulk operations on stored interviews.')
@@ -0,0 +1,247 @@
+"""
+Bulk re-scoring of stored interviews
+
+    flask --app app interviews rescore [--concurrency 4] [--rate-limit 120] [--batch-size 100]
+    flask --app app interviews rescore --emit-batch-file rescore.jsonl
+    flask --app app interviews import-batch-results batch_output.jsonl --prompt-version <version>
+
+`rescore` walks interviews in id order, one batch at a time, and scores each
+batch concurrently under a requests-per-minute limit. Every batch is written
+back in a single transaction together with the prompt version, and a
+checkpoint file records the last finished id so an interrupted run resumes
+where it stopped. Only interviews whose prompt_version differs from the target
+version are picked up, so finished rows are never scored twice.
+
+With --emit-batch-file nothing is called: the requests are written in the
+OpenAI Batch API input format instead, and the provider's output file is
+applied later with `import-batch-results`.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import click
+from flask import current_app
+from sqlalchemy import select, update, or_
+
+from commands import interviews_cli
+from models import db, Interview
+from utils.model_router import get_model_router
+from utils.tenant_clients import employer_openai_client
+from utils.openai_client import (
+    ANALYSIS_PROMPT_VERSION, analysis_request_body, parse_analysis_content, request_transcript_analysis
+)
+
+CUSTOM_ID_PREFIX = 'interview-'
+
+
+class RateLimiter:
+    """Spaces calls evenly so no more than `per_minute` start in any minute"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.lock = threading.Lock()
+        self.next_at = time.monotonic()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class Checkpoint:
+    """Progress of a rescore run, persisted as JSON after every batch"""
+
+    def __init__(self, path, prompt_version):
+        self.path = path
+        self.state = {'prompt_version': prompt_version, 'last_id': 0, 'scored': 0, 'failed': []}
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                state = json.load(f)
+            if state.get('prompt_version') == self.state['prompt_version']:
+                self.state = state
+        return self
+
+    def save(self):
+        self.state['updated_at'] = datetime.utcnow().isoformat()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def iter_batches(prompt_version, after_id, batch_size, limit=None):
+    """
+    Yields lists of (id, employer_id, transcript_text) for interviews not yet scored with
+    `prompt_version`, in id order. Each batch is its own keyset query, so no
+    cursor is held open across the commits made between batches.
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        query = (
+            select(Interview.id, Interview.employer_id, Interview.transcript_text)
+            .where(Interview.id > after_id)
+            .where(Interview.transcript_text.isnot(None))
+            .where(or_(Interview.prompt_version.is_(None), Interview.prompt_version != prompt_version))
+            .order_by(Interview.id)
+            .limit(size)
+            .execution_options(yield_per=size)
+        )
+        rows = db.session.execute(query).all()
+        db.session.rollback()  # End the read transaction before the slow scoring step
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1].id
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def write_scores(results, prompt_version):
+    """Bulk UPDATE by primary key of {interview_id: Interview.analysis_fields(...)} in one transaction"""
+    if not results:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {'id': interview_id, **fields, 'prompt_version': prompt_version, 'updated_at': now}
+        for interview_id, fields in results.items()
+    ]
+    db.session.execute(update(Interview), rows)
+    db.session.commit()
+
+
+@interviews_cli.command('rescore')
+@click.option('--prompt-version', default=ANALYSIS_PROMPT_VERSION, show_default=True,
+              help='Version recorded on re-scored rows; rows already at it are skipped.')
+@click.option('--batch-size', default=100, show_default=True, help='Interviews per batch and per transaction.')
+@click.option('--concurrency', default=4, show_default=True, help='Scoring calls in flight at once.')
+@click.option('--rate-limit', default=60, show_default=True, help='Maximum scoring calls per minute (0 = unlimited).')
+@click.option('--limit', type=int, help='Stop after this many interviews.')
+@click.option('--checkpoint', 'checkpoint_path', help='Checkpoint file (default: instance/rescore-<version>.json).')
+@click.option('--restart', is_flag=True, help='Ignore an existing checkpoint and start from the first interview.')
+@click.option('--emit-batch-file', type=click.Path(dir_okay=False, writable=True),
+              help='Write OpenAI Batch API requests to this file instead of calling the API.')
+def rescore_command(prompt_version, batch_size, concurrency, rate_limit, limit, checkpoint_path, restart, emit_batch_file):
+    """Re-score stored interviews with the current evaluation prompt."""
+    if emit_batch_file:
+        emitted = emit_batch_requests(emit_batch_file, prompt_version, batch_size, limit)
+        click.echo(f"Wrote {emitted} requests to {emit_batch_file}")
+        return
+
+    if not checkpoint_path:
+        os.makedirs(current_app.instance_path, exist_ok=True)
+        checkpoint_path = os.path.join(current_app.instance_path, f"rescore-{prompt_version}.json")
+    checkpoint = Checkpoint(checkpoint_path, prompt_version)
+    if not restart:
+        checkpoint.load()
+    if checkpoint.state['last_id']:
+        click.echo(f"Resuming after interview {checkpoint.state['last_id']} ({checkpoint.state['scored']} scored so far)")
+
+    app = current_app._get_current_object()
+    limiter = RateLimiter(rate_limit)
+
+    def score(row):
+        limiter.acquire()
+        with app.app_context():
+            try:
+                # Employer interviews use (and are billed to) the employer's key, waiting for
+                # one of its slots; column values are built here so a bad reply fails only this row
+                with employer_openai_client(row.employer_id, wait=True) as (client, tenant_id):
+                    analysis = request_transcript_analysis(row.transcript_text, client=client, tenant_id=tenant_id)
+                return row.id, Interview.analysis_fields(analysis), None
+            except Exception as e:
+                return row.id, None, e
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for rows in iter_batches(prompt_version, checkpoint.state['last_id'], batch_size, limit):
+            results, failed = {}, []
+            for interview_id, fields, error in executor.map(score, rows):
+                if error is None:
+                    results[interview_id] = fields
+                else:
+                    failed.append(interview_id)
+                    click.echo(f"Interview {interview_id} failed: {error}", err=True)
+
+            write_scores(results, prompt_version)
+
+            checkpoint.state['last_id'] = rows[-1].id
+            checkpoint.state['scored'] += len(results)
+            checkpoint.state['failed'] = sorted(set(checkpoint.state['failed']) | set(failed))
+            checkpoint.save()
+
+            elapsed = time.monotonic() - started
+            click.echo(f"Scored {checkpoint.state['scored']} (last id {rows[-1].id}, "
+                       f"{len(failed)} failed in batch, {elapsed:.0f}s elapsed)")
+
+    # Usage is flushed in the background; write what is left before the process exits
+    app.extensions['usage'].flush()
+    click.echo(f"Done: {checkpoint.state['scored']} scored, {len(checkpoint.state['failed'])} failed. "
+               f"Failed interviews keep their old scores; rerun with --restart to retry them.")
+
+
+def emit_batch_requests(path, prompt_version, batch_size, limit):
+    """Writes one Batch API request line per interview. Returns the number written."""
+    router = get_model_router()
+    emitted = 0
+    with open(path, 'w') as f:
+        for rows in iter_batches(prompt_version, 0, batch_size, limit):
+            for row in rows:
+                route = router.choose('analyze_transcript', input_chars=len(row.transcript_text))
+                f.write(json.dumps({
+                    'custom_id': f"{CUSTOM_ID_PREFIX}{row.id}",
+                    'method': 'POST',
+                    'url': '/v1/chat/completions',
+                    'body': analysis_request_body(row.transcript_text, route),
+                }) + '\n')
+                emitted += 1
+    return emitted
+
+
+@interviews_cli.command('import-batch-results')
+@click.argument('output_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--prompt-version', required=True, help='Prompt version the batch was emitted with.')
+@click.option('--batch-size', default=500, show_default=True, help='Rows per transaction.')
+def import_batch_results_command(output_file, prompt_version, batch_size):
+    """Apply an OpenAI Batch API output file produced from --emit-batch-file."""
+    results, imported, failed = {}, 0, 0
+    with open(output_file) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            custom_id = entry.get('custom_id', '')
+            response = entry.get('response') or {}
+            if not custom_id.startswith(CUSTOM_ID_PREFIX) or response.get('status_code') != 200:
+                failed += 1
+                click.echo(f"Skipping {custom_id or '<no id>'}: {entry.get('error') or response.get('status_code')}", err=True)
+                continue
+            try:
+                content = response['body']['choices'][0]['message']['content']
+                fields = Interview.analysis_fields(parse_analysis_content(content))
+                results[int(custom_id[len(CUSTOM_ID_PREFIX):])] = fields
+            except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+                failed += 1
+                click.echo(f"Skipping {custom_id}: {e}", err=True)
+                continue
+
+            if len(results) >= batch_size:
+                write_scores(results, prompt_version)
+                imported += len(results)
+                results = {}
+
+    write_scores(results, prompt_version)
+    imported += len(results)
+    click.echo(f"Imported {imported} results, skipped {failed}")
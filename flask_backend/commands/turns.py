@@ -0,0 +1,59 @@
+"""
+Backfill of interview turns
+
+    flask --app app interviews split-turns [--batch-size 200]
+
+Interviews stored before the interview_turns table existed only have
+transcript_text. This splits each of them into turns, a batch of interviews
+at a time, with one multi-row INSERT and one commit per batch. updated_at is
+bumped on every interview that gets turns, so clients holding an ETag for its
+(empty) turns refetch them. Interviews that already have turns are skipped, so
+the command can be rerun after an interruption.
+"""
+
+from datetime import datetime
+
+import click
+from sqlalchemy import select, insert, update, exists
+
+from commands import interviews_cli
+from models import db, Interview, InterviewTurn
+from utils.transcript import parse_transcript
+
+
+@interviews_cli.command('split-turns')
+@click.option('--batch-size', default=200, show_default=True, help='Interviews per transaction.')
+def split_turns_command(batch_size):
+    """Split stored transcripts into interview_turns rows."""
+    has_turns = exists().where(InterviewTurn.interview_id == Interview.id)
+    after_id, interviews, turns = 0, 0, 0
+    while True:
+        rows = db.session.execute(
+            select(Interview.id, Interview.transcript_text)
+            .where(Interview.id > after_id, Interview.transcript_text.isnot(None), ~has_turns)
+            .order_by(Interview.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        values = [
+            {**turn, 'interview_id': row.id}
+            for row in rows
+            for turn in parse_transcript(row.transcript_text)
+        ]
+        if values:
+            db.session.execute(insert(InterviewTurn), values)
+            # The turns endpoint's ETag derives from updated_at, so cached empty pages must go stale
+            split_ids = sorted({value['interview_id'] for value in values})
+            db.session.execute(
+                update(Interview).where(Interview.id.in_(split_ids)).values(updated_at=datetime.utcnow())
+            )
+        db.session.commit()
+
+        after_id = rows[-1].id
+        interviews += len(rows)
+        turns += len(values)
+        click.echo(f"Split {interviews} interviews into {turns} turns (last id {after_id})")
+
+    click.echo(f"Done: {interviews} interviews, {turns} turns")
@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration
+
+With preloading on (the default) the app is created once in the master and
+workers are forked from it, so they start without re-importing Flask, the
+models or the OpenAI SDK.
+"""
+
+import os
+
+wsgi_app = 'wsgi:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120)) # OpenAI calls can be slow
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+def when_ready(server):
+    """Runs in the master before the first workers are forked"""
+    if preload_app:
+        from utils.openai_client import preload_sdk
+        preload_sdk()
+
+def post_fork(server, worker):
+    """Drop any pooled DB connections inherited from the master"""
+    if preload_app:
+        from wsgi import app
+        from models import db
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+def worker_exit(server, worker):
+    """Write the worker's pending usage totals before it exits"""
+    from wsgi import app
+    app.extensions['usage'].flush()
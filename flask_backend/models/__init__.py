@@ -4,4 +4,6 @@ from .user import User, db # Added db here
 from .candidate import Candidate
 from .employer import Employer
 from .interview import Interview
-
+from .recording_upload import RecordingUpload
+from .tenant_usage import TenantUsage
+from .interview_turn import InterviewTurn
@@ -10,6 +10,11 @@ class Employer(User):
     industry = db.Column(db.String(100))
     company_size = db.Column(db.String(50))
     website = db.Column(db.String(255))
+
+    # Tenant OpenAI credentials (see utils/tenant_clients.py); the key is stored encrypted
+    openai_api_key_encrypted = db.Column(db.Text)
+    openai_api_key_last4 = db.Column(db.String(4))
+    openai_max_concurrency = db.Column(db.Integer) # Falls back to TENANT_MAX_CONCURRENCY
     
     # Relationships
     interviews = db.relationship('Interview', back_populates='employer', cascade="all, delete-orphan")
@@ -25,6 +30,8 @@ class Employer(User):
             'company_name': self.company_name,
             'industry': self.industry,
             'company_size': self.company_size,
-            'website': self.website
+            'website': self.website,
+            'api_key_configured': self.openai_api_key_encrypted is not None,
+            'api_key_last4': self.openai_api_key_last4
         }
         return {**base_dict, **employer_dict}
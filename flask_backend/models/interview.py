@@ -25,12 +25,14 @@ class Interview(db.Model):
     accuracy_justification = db.Column(db.Text) # Renamed from accuracy_score_justification for consistency
     
     overall_summary = db.Column(db.Text) # Can be used for general feedback
+    prompt_version = db.Column(db.String(50), index=True) # Evaluation prompt that produced the scores
 
     # Existing score and feedback can be populated by new analysis or kept separate
     score = db.Column(db.Float) # Could be an average of the new scores
     feedback = db.Column(db.Text) # Could be the overall_summary
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     scheduled_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
     
@@ -41,6 +43,40 @@ class Interview(db.Model):
     # Relationships
     candidate = db.relationship('Candidate', back_populates='interviews')
     employer = db.relationship('Employer', back_populates='interviews')
+    turns = db.relationship('InterviewTurn', back_populates='interview', order_by='InterviewTurn.position',
+                            cascade="all, delete-orphan")
+
+    @staticmethod
+    def analysis_fields(analysis):
+        """Column values for an analysis result from request_transcript_analysis"""
+        scores = [
+            analysis.get(key, {}).get('score')
+            for key in ('language_score', 'personality_score', 'accuracy_score')
+        ]
+        scores = [score for score in scores if score is not None]
+
+        return {
+            'language_score': analysis.get('language_score', {}).get('score'),
+            'language_justification': analysis.get('language_score', {}).get('justification'),
+            'personality_score': analysis.get('personality_score', {}).get('score'),
+            'personality_justification': analysis.get('personality_score', {}).get('justification'),
+            'accuracy_score': analysis.get('accuracy_score', {}).get('score'),
+            'accuracy_justification': analysis.get('accuracy_score', {}).get('justification'),
+            'overall_summary': analysis.get('overall_summary'),
+            'score': sum(scores) / len(scores) if scores else None, # Average of the new scores
+            'feedback': analysis.get('overall_summary'), # Populate existing feedback with summary
+        }
+
+    def apply_analysis(self, analysis, prompt_version):
+        """Store an analysis result and the prompt version that produced it"""
+        for field, value in self.analysis_fields(analysis).items():
+            setattr(self, field, value)
+        self.prompt_version = prompt_version
+
+    @property
+    def last_modified(self):
+        """When this interview last changed (rows predating updated_at fall back to older timestamps)"""
+        return self.updated_at or self.completed_at or self.created_at
     
     def to_dict(self):
         """Convert interview object to dictionary"""
@@ -59,11 +95,13 @@ class Interview(db.Model):
             'accuracy_score': self.accuracy_score,
             'accuracy_justification': self.accuracy_justification,
             'overall_summary': self.overall_summary,
+            'prompt_version': self.prompt_version,
             
             'score': self.score, # Kept for now
             'feedback': self.feedback, # Kept for now
 
             'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'scheduled_at': self.scheduled_at.isoformat() if self.scheduled_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'candidate_id': self.candidate_id,
@@ -0,0 +1,43 @@
+from .user import db
+
+class InterviewTurn(db.Model):
+    """One speaker turn of an interview transcript, split out by utils/transcript.py"""
+    __tablename__ = 'interview_turns'
+    __table_args__ = (
+        db.Index('ix_interview_turns_interview_position', 'interview_id', 'position', unique=True),
+        db.Index('ix_interview_turns_interview_question', 'interview_id', 'question_index'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    interview_id = db.Column(db.Integer, db.ForeignKey('interviews.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False) # Order within the transcript, from 0
+    speaker = db.Column(db.String(60)) # Label as sent by the client, e.g. "AI Interviewer"
+    role = db.Column(db.String(20), nullable=False) # interviewer, candidate, system
+    question_index = db.Column(db.Integer, nullable=False) # Interviewer turn this turn belongs to, from 0
+
+    # The turn's text is transcript_text[start_offset:end_offset]
+    start_offset = db.Column(db.Integer, nullable=False)
+    end_offset = db.Column(db.Integer, nullable=False)
+    text = db.Column(db.Text, nullable=False)
+
+    timestamp_label = db.Column(db.String(40)) # Timestamp as sent by the client
+    spoken_at = db.Column(db.DateTime) # UTC, when the label is an ISO timestamp
+    elapsed_s = db.Column(db.Float) # Seconds since the first timed turn
+
+    # Relationships
+    interview = db.relationship('Interview', back_populates='turns')
+
+    def to_dict(self):
+        """Convert turn object to dictionary"""
+        return {
+            'position': self.position,
+            'speaker': self.speaker,
+            'role': self.role,
+            'question_index': self.question_index,
+            'start_offset': self.start_offset,
+            'end_offset': self.end_offset,
+            'text': self.text,
+            'timestamp': self.timestamp_label,
+            'spoken_at': self.spoken_at.isoformat() if self.spoken_at else None,
+            'elapsed_s': self.elapsed_s
+        }
@@ -0,0 +1,34 @@
+from datetime import datetime
+from .user import db
+
+class RecordingUpload(db.Model):
+    """Tracks a resumable, chunked upload of an interview recording"""
+    __tablename__ = 'recording_uploads'
+
+    id = db.Column(db.String(32), primary_key=True) # Random hex token handed to the client
+    interview_id = db.Column(db.Integer, db.ForeignKey('interviews.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), default='in_progress') # in_progress, completed, aborted
+    content_type = db.Column(db.String(100))
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received_size = db.Column(db.BigInteger, default=0, nullable=False)
+    storage_key = db.Column(db.String(255)) # Set once the upload is completed
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+
+    # Relationships
+    interview = db.relationship('Interview')
+
+    def to_dict(self):
+        """Convert upload object to dictionary"""
+        return {
+            'upload_id': self.id,
+            'interview_id': self.interview_id,
+            'status': self.status,
+            'content_type': self.content_type,
+            'total_size': self.total_size,
+            'received_size': self.received_size,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
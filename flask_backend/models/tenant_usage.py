@@ -0,0 +1,34 @@
+from datetime import datetime
+from .user import db
+
+class TenantUsage(db.Model):
+    """OpenAI usage per employer, model and day, accumulated by utils/usage.py"""
+    __tablename__ = 'tenant_usage'
+    __table_args__ = (
+        db.UniqueConstraint('employer_id', 'day', 'model', name='uq_tenant_usage_employer_day_model'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    employer_id = db.Column(db.Integer, db.ForeignKey('employers.id'), nullable=False) # Indexed by the unique constraint
+    day = db.Column(db.Date, nullable=False) # UTC
+    model = db.Column(db.String(50), nullable=False)
+
+    requests = db.Column(db.Integer, default=0, nullable=False)
+    prompt_tokens = db.Column(db.BigInteger, default=0, nullable=False)
+    completion_tokens = db.Column(db.BigInteger, default=0, nullable=False)
+    audio_seconds = db.Column(db.Float, default=0.0, nullable=False) # Transcribed audio
+    characters = db.Column(db.BigInteger, default=0, nullable=False) # Text sent to text-to-speech
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert usage row to dictionary"""
+        return {
+            'day': self.day.isoformat(),
+            'model': self.model,
+            'requests': self.requests,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'audio_seconds': self.audio_seconds,
+            'characters': self.characters
+        }
@@ -0,0 +1,115 @@
+"""
+Admin routes for diagnostics
+
+All routes require the X-Admin-Token header to match the ADMIN_TOKEN setting;
+they are disabled (404) when ADMIN_TOKEN is not set.
+"""
+
+import hmac
+import os
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app, send_from_directory
+
+from utils.model_router import get_model_router
+from utils.openai_client import set_api_key, verify_api_key
+from utils.profiling import PROFILE_MODES
+
+# Create blueprint for admin routes
+admin_routes = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+def admin_required(view):
+    """Allow the request only with a valid X-Admin-Token header"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        admin_token = current_app.config.get('ADMIN_TOKEN')
+        if not admin_token:
+            return jsonify({"error": "Not found"}), 404
+        supplied = request.headers.get('X-Admin-Token', '')
+        if not hmac.compare_digest(supplied.encode('utf-8'), admin_token.encode('utf-8')):
+            return jsonify({"error": "Invalid admin token"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def _profiling():
+    return current_app.extensions['profiling']
+
+@admin_routes.route('/profiling', methods=['GET'])
+@admin_required
+def get_profiling():
+    """List active profiling rules and the profiles written so far"""
+    profiling = _profiling()
+    output_dir = profiling['output_dir']
+    names = os.listdir(output_dir) if os.path.isdir(output_dir) else []
+    profiles = sorted(
+        (name for name in names if name.endswith(('.prof', '.folded'))),
+        key=lambda name: os.path.getmtime(os.path.join(output_dir, name)),
+        reverse=True
+    )
+    return jsonify({"rules": profiling['switch'].rules(), "profiles": profiles[:200]})
+
+@admin_routes.route('/profiling', methods=['POST'])
+@admin_required
+def enable_profiling():
+    """
+    Profile a fraction of the requests to one route.
+    JSON body: route (URL rule, e.g. "/api/generate-response"), rate (0-1),
+    mode ("cprofile" or "stack"), duration_s, interval_ms (stack mode).
+    """
+    data = request.json or {}
+    route = data.get('route')
+    if not route or not any(rule.rule == route for rule in current_app.url_map.iter_rules()):
+        return jsonify({"error": "route must be an existing URL rule"}), 400
+
+    mode = data.get('mode', 'stack')
+    if mode not in PROFILE_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(PROFILE_MODES)}"}), 400
+
+    try:
+        rate = float(data.get('rate', 0.1))
+        duration_s = float(data.get('duration_s', 300))
+        interval_ms = float(data.get('interval_ms', 5))
+    except (TypeError, ValueError):
+        return jsonify({"error": "rate, duration_s and interval_ms must be numbers"}), 400
+    if not 0 < rate <= 1 or duration_s <= 0 or interval_ms <= 0:
+        return jsonify({"error": "rate must be in (0, 1]; duration_s and interval_ms must be positive"}), 400
+
+    rule = _profiling()['switch'].enable(route, rate, mode, duration_s, interval_ms)
+    return jsonify({"route": route, **rule}), 201
+
+@admin_routes.route('/profiling', methods=['DELETE'])
+@admin_required
+def disable_profiling():
+    """Stop profiling one route (?route=...) or all routes"""
+    _profiling()['switch'].disable(request.args.get('route'))
+    return jsonify({"message": "Profiling disabled"})
+
+@admin_routes.route('/profiling/<path:filename>', methods=['GET'])
+@admin_required
+def download_profile(filename):
+    """Download a written profile"""
+    return send_from_directory(_profiling()['output_dir'], filename, as_attachment=True)
+
+@admin_routes.route('/model-routes', methods=['GET'])
+@admin_required
+def model_routes():
+    """Per-route call counts, latency and token usage of this worker's model router"""
+    return jsonify({"routes": get_model_router().summary()})
+
+@admin_routes.route('/openai-key', methods=['POST'])
+@admin_required
+def set_default_api_key():
+    """
+    Replace this worker's default OpenAI key, used for requests without an
+    employer key. Other workers keep OPENAI_API_KEY.
+    """
+    data = request.json or {}
+    api_key = data.get('api_key')
+    if not isinstance(api_key, str) or not api_key.strip():
+        return jsonify({"error": "API key must be a non-empty string"}), 400
+    api_key = api_key.strip()
+    try:
+        verify_api_key(api_key)
+    except Exception as e:
+        return jsonify({"error": f"Invalid API key: {str(e)}"}), 400
+    set_api_key(api_key)
+    return jsonify({"status": "ok", "message": "API key set successfully"})
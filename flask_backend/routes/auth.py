@@ -16,34 +16,92 @@ from email_validator import validate_email, EmailNotValidError
 from models.user import User, db
 from models.candidate import Candidate
 from models.employer import Employer
-from utils.openai_client import set_api_key, is_api_key_configured
+from models.tenant_usage import TenantUsage
+from utils.openai_client import is_api_key_configured, verify_api_key
+from utils.key_encryption import encrypt_api_key, KeyEncryptionError
+from utils.tenant_clients import current_employer, get_tenant_clients
+from utils.http_cache import conditional_json, make_etag
 
 # Create blueprint for auth routes
 auth_routes = Blueprint('auth', __name__)
 
 @auth_routes.route("/api/set-api-key", methods=["POST"])
 def set_api_key_route():
-    """Set the OpenAI API key"""
+    """
+    Store the employer's own OpenAI API key (and optional max_concurrency),
+    encrypted, for its requests only. The default key is set through
+    /api/admin/openai-key.
+    """
+    employer = current_employer()
+    if employer is None:
+        return jsonify({"error": "Only employers can store an API key"}), 403
+
     data = request.json
     
     if not data or "api_key" not in data:
         return jsonify({"error": "Missing API key"}), 400
-    
-    # Test if the API key works
+
+    return _set_employer_api_key(employer, data)
+
+@auth_routes.route("/api/set-api-key", methods=["DELETE"])
+@jwt_required()
+def delete_api_key_route():
+    """Remove the employer's own API key; its requests fall back to the default key"""
+    employer = current_employer()
+    if employer is None:
+        return jsonify({"error": "Only employers can store an API key"}), 403
+
+    employer.openai_api_key_encrypted = None
+    employer.openai_api_key_last4 = None
+    employer.updated_at = datetime.datetime.utcnow()
+    db.session.commit()
+    get_tenant_clients().evict(employer.id)
+    return jsonify({"status": "ok", "message": "API key removed"})
+
+@auth_routes.route("/api/usage", methods=["GET"])
+@jwt_required()
+def get_usage():
+    """Daily OpenAI usage of the employer's own key (?days=30)"""
+    employer = current_employer()
+    if employer is None:
+        return jsonify({"error": "Only employers have usage records"}), 403
+
+    days = request.args.get('days', 30, type=int)
+    since = datetime.datetime.utcnow().date() - datetime.timedelta(days=max(days, 1) - 1)
+    rows = (TenantUsage.query
+            .filter(TenantUsage.employer_id == employer.id, TenantUsage.day >= since)
+            .order_by(TenantUsage.day.desc(), TenantUsage.model)
+            .all())
+    return jsonify({"usage": [row.to_dict() for row in rows]})
+
+def _set_employer_api_key(employer, data):
+    api_key = data["api_key"]
+    max_concurrency = data.get("max_concurrency")
+    if not isinstance(api_key, str) or not api_key.strip():
+        return jsonify({"error": "API key must be a non-empty string"}), 400
+    api_key = api_key.strip()
+    if max_concurrency is not None and (not isinstance(max_concurrency, int) or not 1 <= max_concurrency <= 64):
+        return jsonify({"error": "max_concurrency must be an integer between 1 and 64"}), 400
+
     try:
-        # Initialize client and make a test request
-        client = set_api_key(data["api_key"])
-        
-        # Make a simple test request to verify the API key
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": "Test"}],
-            max_tokens=5
-        )
-        return jsonify({"status": "ok", "message": "API key set successfully"})
+        encrypted = encrypt_api_key(api_key)
+    except KeyEncryptionError as e:
+        print(f"Cannot store tenant API key: {e}")
+        return jsonify({"error": "Storing API keys is not configured on this server"}), 503
+
+    try:
+        verify_api_key(api_key)
     except Exception as e:
         return jsonify({"error": f"Invalid API key: {str(e)}"}), 400
 
+    employer.openai_api_key_encrypted = encrypted
+    employer.openai_api_key_last4 = api_key[-4:]
+    employer.openai_max_concurrency = max_concurrency
+    employer.updated_at = datetime.datetime.utcnow()
+    db.session.commit()
+    get_tenant_clients().evict(employer.id)
+    return jsonify({"status": "ok", "message": "API key set successfully"})
+
 @auth_routes.route("/api/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
@@ -69,7 +127,7 @@ def register_candidate():
             
     # Validate email format
     try:
-        validate_email(data['email'])
+        validate_email(data['email'], check_deliverability=current_app.config['EMAIL_CHECK_DELIVERABILITY'])
     except EmailNotValidError as e:
         return jsonify({"error": f"Invalid email: {str(e)}"}), 400
             
@@ -119,7 +177,7 @@ def register_employer():
             
     # Validate email format
     try:
-        validate_email(data['email'])
+        validate_email(data['email'], check_deliverability=current_app.config['EMAIL_CHECK_DELIVERABILITY'])
     except EmailNotValidError as e:
         return jsonify({"error": f"Invalid email: {str(e)}"}), 400
             
@@ -204,10 +262,10 @@ def get_user_profile():
     
     if not user:
         return jsonify({"error": "User not found"}), 404
-        
-    return jsonify({
-        "user": user.to_dict()
-    }), 200
+
+    last_modified = user.updated_at or user.created_at
+    etag = make_etag('user', user.id, last_modified)
+    return conditional_json(lambda: {"user": user.to_dict()}, etag, last_modified)
 
 @auth_routes.route("/api/auth/logout", methods=["POST"])
 @jwt_required()
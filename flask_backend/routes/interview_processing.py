@@ -1,8 +1,12 @@
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Interview, User
-from utils.openai_client import analyze_transcript_with_openai
+from sqlalchemy import func, insert
+from models import db, Interview, InterviewTurn, User
+from utils.openai_client import request_transcript_analysis, failed_analysis, ANALYSIS_PROMPT_VERSION
+from utils.http_cache import conditional_json, make_etag
+from utils.transcript import parse_transcript
+from utils.tenant_clients import employer_openai_client, TenantBusyError
 from datetime import datetime
 
 interview_processing_routes = Blueprint('interview_processing_routes', __name__, url_prefix='/api/interviews')
@@ -20,8 +24,10 @@ def complete_interview():
     transcript_text = data.get('transcript_text')
     title = data.get('title', f"AI Practice Interview - {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}")
 
-    if not video_url or not transcript_text:
-        return jsonify({"msg": "Missing video_url or transcript_text"}), 400
+    # video_url is optional: the recording can be uploaded afterwards through
+    # the chunked upload endpoints, which set recording_url when they finish
+    if not transcript_text:
+        return jsonify({"msg": "Missing transcript_text"}), 400
 
     try:
         # Ensure the user is a candidate
@@ -32,50 +38,39 @@ def complete_interview():
 
         candidate_id = user.id
 
-        # Analyze transcript with OpenAI
-        analysis = analyze_transcript_with_openai(transcript_text)
-
-        # Calculate average score
-        total_score = 0
-        num_scores = 0
-        if analysis.get('language_score', {}).get('score') is not None:
-            total_score += analysis['language_score']['score']
-            num_scores += 1
-        if analysis.get('personality_score', {}).get('score') is not None:
-            total_score += analysis['personality_score']['score']
-            num_scores += 1
-        if analysis.get('accuracy_score', {}).get('score') is not None:
-            total_score += analysis['accuracy_score']['score']
-            num_scores += 1
-        
-        average_score = total_score / num_scores if num_scores > 0 else None
-
-
         new_interview = Interview(
             title=title,
             candidate_id=candidate_id, # Automatically link to the logged-in candidate
             recording_url=video_url,
             transcript_text=transcript_text,
             status='completed',
-            completed_at=datetime.utcnow(),
-            
-            language_score=analysis.get('language_score', {}).get('score'),
-            language_justification=analysis.get('language_score', {}).get('justification'),
-            personality_score=analysis.get('personality_score', {}).get('score'),
-            personality_justification=analysis.get('personality_score', {}).get('justification'),
-            accuracy_score=analysis.get('accuracy_score', {}).get('score'),
-            accuracy_justification=analysis.get('accuracy_score', {}).get('justification'),
-            overall_summary=analysis.get('overall_summary'),
-            
-            score=average_score, # Populate existing score field with average
-            feedback=analysis.get('overall_summary') # Populate existing feedback with summary
+            completed_at=datetime.utcnow()
         )
 
+        # Analyze transcript with OpenAI, on the interview's employer's key if it has one.
+        # A failed analysis is stored as a placeholder without a prompt version, so
+        # `flask interviews rescore` retries it.
+        with employer_openai_client(new_interview.employer_id) as (client, tenant_id):
+            try:
+                analysis = request_transcript_analysis(transcript_text, client=client, tenant_id=tenant_id)
+                new_interview.apply_analysis(analysis, ANALYSIS_PROMPT_VERSION)
+            except Exception as e:
+                print(f"Error analyzing transcript with OpenAI: {e}")
+                new_interview.apply_analysis(failed_analysis(e), None)
+
         db.session.add(new_interview)
+        db.session.flush() # Assigns the id the turns refer to
+
+        # Store the transcript's turns with one multi-row INSERT
+        turns = parse_transcript(transcript_text)
+        if turns:
+            db.session.execute(insert(InterviewTurn), [{**turn, 'interview_id': new_interview.id} for turn in turns])
         db.session.commit()
 
         return jsonify(new_interview.to_dict()), 201
 
+    except TenantBusyError as e:
+        return jsonify({"msg": str(e)}), 429
     except ValueError as ve: # Catch specific errors like API key missing
         return jsonify({"msg": str(ve)}), 500
     except Exception as e:
@@ -83,3 +78,108 @@ def complete_interview():
         print(f"Error completing interview: {e}") # Log the full error
         return jsonify({"msg": "Failed to complete interview", "error": str(e)}), 500
 
+
+def _interview_owner_filter(user):
+    """Interviews visible to the user: their own as a candidate, or those they run as an employer"""
+    if user.user_type == 'employer':
+        return Interview.employer_id == user.id
+    return Interview.candidate_id == user.id
+
+@interview_processing_routes.route('', methods=['GET'])
+@jwt_required()
+def list_interviews():
+    """List the current user's interviews, answering 304 when nothing changed"""
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return jsonify({"msg": "User not found"}), 404
+
+    owner_filter = _interview_owner_filter(user)
+
+    # Cheap aggregate first: the full rows are only loaded if the client's copy is stale
+    last_changed = func.coalesce(Interview.updated_at, Interview.completed_at, Interview.created_at)
+    count, last_modified = db.session.query(func.count(Interview.id), func.max(last_changed)).filter(owner_filter).one()
+    etag = make_etag('interviews', user.id, count, last_modified)
+
+    def build_payload():
+        interviews = Interview.query.filter(owner_filter).order_by(Interview.created_at.desc()).all()
+        return {"interviews": [interview.to_dict() for interview in interviews]}
+
+    return conditional_json(build_payload, etag, last_modified)
+
+@interview_processing_routes.route('/<int:interview_id>', methods=['GET'])
+@jwt_required()
+def get_interview(interview_id):
+    """Get one interview, answering 304 when the client's copy is current"""
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return jsonify({"msg": "User not found"}), 404
+
+    interview = Interview.query.get(interview_id)
+    if not interview:
+        return jsonify({"msg": "Interview not found"}), 404
+    if user.id not in (interview.candidate_id, interview.employer_id):
+        return jsonify({"msg": "Not allowed to access this interview"}), 403
+
+    etag = make_etag('interview', interview.id, interview.last_modified)
+    return conditional_json(interview.to_dict, etag, interview.last_modified)
+
+TURNS_PAGE_SIZE = 100
+TURNS_MAX_PAGE_SIZE = 500
+
+@interview_processing_routes.route('/<int:interview_id>/turns', methods=['GET'])
+@jwt_required()
+def get_interview_turns(interview_id):
+    """
+    Get a range of transcript turns without loading the whole transcript.
+    Query parameters (all optional):
+    - start, end: turn positions, end exclusive (at most 500 turns per call)
+    - question_start, question_end: question indexes, both inclusive
+    - role: interviewer, candidate or system
+    """
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return jsonify({"msg": "User not found"}), 404
+
+    # Only the columns needed for the access check and the ETag, not the transcript
+    interview = db.session.query(
+        Interview.candidate_id, Interview.employer_id,
+        func.coalesce(Interview.updated_at, Interview.completed_at, Interview.created_at).label('last_modified')
+    ).filter(Interview.id == interview_id).first()
+    if not interview:
+        return jsonify({"msg": "Interview not found"}), 404
+    if user.id not in (interview.candidate_id, interview.employer_id):
+        return jsonify({"msg": "Not allowed to access this interview"}), 403
+
+    start = request.args.get('start', 0, type=int)
+    end = request.args.get('end', type=int)
+    question_start = request.args.get('question_start', type=int)
+    question_end = request.args.get('question_end', type=int)
+    role = request.args.get('role')
+    if start < 0 or (end is not None and end < start):
+        return jsonify({"msg": "start must be >= 0 and end >= start"}), 400
+    if role is not None and role not in ('interviewer', 'candidate', 'system'):
+        return jsonify({"msg": "role must be interviewer, candidate or system"}), 400
+    limit = min(end - start if end is not None else TURNS_PAGE_SIZE, TURNS_MAX_PAGE_SIZE)
+
+    etag = make_etag('turns', interview_id, interview.last_modified, request.query_string.decode('utf-8'))
+
+    def build_payload():
+        query = InterviewTurn.query.filter(InterviewTurn.interview_id == interview_id, InterviewTurn.position >= start)
+        if end is not None:
+            query = query.filter(InterviewTurn.position < end)
+        if question_start is not None:
+            query = query.filter(InterviewTurn.question_index >= question_start)
+        if question_end is not None:
+            query = query.filter(InterviewTurn.question_index <= question_end)
+        if role is not None:
+            query = query.filter(InterviewTurn.role == role)
+        # One extra row tells whether there is a next page
+        turns = query.order_by(InterviewTurn.position).limit(limit + 1).all()
+        next_start = turns[limit].position if len(turns) > limit else None
+        return {
+            "interview_id": interview_id,
+            "turns": [turn.to_dict() for turn in turns[:limit]],
+            "next_start": next_start
+        }
+
+    return conditional_json(build_payload, etag, interview.last_modified)
@@ -0,0 +1,343 @@
+"""
+Interview recording upload and playback routes
+
+Recordings are uploaded in sequential chunks so an interrupted upload can be
+resumed from the last acknowledged byte, and are served back with HTTP Range
+support so long interviews can be seeked without downloading them in full.
+"""
+
+import hashlib
+import re
+import secrets
+from datetime import datetime
+from flask import Blueprint, request, jsonify, current_app, send_file, redirect, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import update
+
+from models import db, Interview, User, RecordingUpload
+from utils.recording_storage import get_recording_storage
+
+# Create blueprint for recording routes
+recording_routes = Blueprint('recordings', __name__, url_prefix='/api/interviews')
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+CHUNK_CHECKSUM_HEADER = 'X-Chunk-Checksum'
+
+# File extensions used for stored recordings, by content type
+RECORDING_EXTENSIONS = {
+    'video/webm': '.webm',
+    'video/mp4': '.mp4',
+    'video/quicktime': '.mov',
+    'audio/webm': '.weba',
+}
+
+
+class _FileRange:
+    """
+    Read-only view of `length` bytes of an open file, starting at its current
+    position. Gunicorn sends it with sendfile from that position for
+    Content-Length bytes; other servers' file wrappers read it up to the end of
+    the range.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _get_interview_for_user(interview_id, allow_employer=False):
+    """
+    Loads an interview the current user is allowed to access.
+    Returns (interview, error_response).
+    """
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return None, (jsonify({"error": "User not found"}), 404)
+
+    interview = Interview.query.get(interview_id)
+    if not interview:
+        return None, (jsonify({"error": "Interview not found"}), 404)
+
+    is_owner = interview.candidate_id == user.id
+    is_employer = allow_employer and interview.employer_id is not None and interview.employer_id == user.id
+    if not (is_owner or is_employer):
+        return None, (jsonify({"error": "Not allowed to access this interview"}), 403)
+
+    return interview, None
+
+
+def _get_upload(interview_id, upload_id):
+    """Loads an upload belonging to the interview, or returns an error response."""
+    upload = RecordingUpload.query.filter_by(id=upload_id, interview_id=interview_id).first()
+    if not upload:
+        return None, (jsonify({"error": "Upload not found"}), 404)
+    return upload, None
+
+
+def _parse_checksum(header_value):
+    """Parses an 'sha256=<hex>' checksum header. Returns the hex digest or None."""
+    if not header_value:
+        return None
+    algorithm, _, digest = header_value.partition('=')
+    if algorithm.strip().lower() != 'sha256' or not digest:
+        return None
+    return digest.strip().lower()
+
+
+def _upload_response(upload, status_code=200):
+    data = upload.to_dict()
+    data['chunk_size'] = current_app.config['RECORDING_MAX_CHUNK_SIZE']
+    response = jsonify(data)
+    response.headers['Upload-Offset'] = str(upload.received_size)
+    return response, status_code
+
+
+@recording_routes.route('/<int:interview_id>/recording/uploads', methods=['POST'])
+@jwt_required()
+def create_upload(interview_id):
+    """Start a resumable recording upload for an interview"""
+    interview, error = _get_interview_for_user(interview_id)
+    if error:
+        return error
+
+    data = request.json or {}
+    total_size = data.get('total_size')
+    if not isinstance(total_size, int) or total_size <= 0:
+        return jsonify({"error": "total_size must be a positive integer"}), 400
+    if total_size > current_app.config['RECORDING_MAX_SIZE']:
+        return jsonify({"error": "Recording is too large"}), 413
+
+    content_type = data.get('content_type', 'video/webm')
+    if content_type not in RECORDING_EXTENSIONS:
+        return jsonify({"error": f"Unsupported content type: {content_type}"}), 400
+
+    upload = RecordingUpload(
+        id=secrets.token_hex(16),
+        interview_id=interview.id,
+        content_type=content_type,
+        total_size=total_size,
+        received_size=0
+    )
+
+    try:
+        get_recording_storage().begin_upload(upload.id, total_size)
+        db.session.add(upload)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error starting recording upload: {e}")
+        return jsonify({"error": f"Failed to start upload: {str(e)}"}), 500
+
+    return _upload_response(upload, 201)
+
+
+@recording_routes.route('/<int:interview_id>/recording/uploads/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_upload_status(interview_id, upload_id):
+    """Report how much of an upload has been received, so the client can resume"""
+    interview, error = _get_interview_for_user(interview_id)
+    if error:
+        return error
+
+    upload, error = _get_upload(interview.id, upload_id)
+    if error:
+        return error
+
+    return _upload_response(upload)
+
+
+@recording_routes.route('/<int:interview_id>/recording/uploads/<upload_id>', methods=['PUT'])
+@jwt_required()
+def upload_chunk(interview_id, upload_id):
+    """
+    Receive one chunk of a recording.
+
+    The chunk position is given by a 'Content-Range: bytes <start>-<end>/<total>'
+    header and its SHA-256 by an 'X-Chunk-Checksum: sha256=<hex>' header.
+    Chunks must arrive in order; <start> must equal the current upload offset.
+    """
+    interview, error = _get_interview_for_user(interview_id)
+    if error:
+        return error
+
+    upload, error = _get_upload(interview.id, upload_id)
+    if error:
+        return error
+
+    if upload.status != 'in_progress':
+        return jsonify({"error": f"Upload is {upload.status}"}), 409
+
+    match = CONTENT_RANGE_RE.match(request.headers.get('Content-Range', ''))
+    if not match:
+        return jsonify({"error": "Missing or invalid Content-Range header"}), 400
+    start, end, total = (int(value) for value in match.groups())
+
+    if total != upload.total_size or end < start or end >= total:
+        return jsonify({"error": "Content-Range does not match the upload"}), 416
+
+    length = end - start + 1
+    if length > current_app.config['RECORDING_MAX_CHUNK_SIZE']:
+        return jsonify({"error": "Chunk is too large"}), 413
+    if request.content_length != length:
+        return jsonify({"error": "Content-Length does not match Content-Range"}), 400
+
+    expected_checksum = _parse_checksum(request.headers.get(CHUNK_CHECKSUM_HEADER))
+    if not expected_checksum:
+        return jsonify({"error": f"Missing or invalid {CHUNK_CHECKSUM_HEADER} header"}), 400
+
+    storage = get_recording_storage()
+    hasher = hashlib.sha256()
+    completing = False
+
+    try:
+        # Claim the chunk before writing it. The conditional UPDATE matches only if
+        # no other request has stored this offset yet, and holds the row lock until
+        # this request commits, so two requests for the same chunk (e.g. a retry
+        # after a timeout) never write into the part file together.
+        claimed = db.session.execute(
+            update(RecordingUpload)
+            .where(RecordingUpload.id == upload.id,
+                   RecordingUpload.status == 'in_progress',
+                   RecordingUpload.received_size == start)
+            .values(received_size=start + length)
+        ).rowcount
+        if not claimed:
+            db.session.rollback()
+            db.session.refresh(upload)
+            # Out-of-order or repeated chunk: tell the client where to resume from
+            response, _ = _upload_response(upload)
+            return response, 409
+
+        written = storage.write_chunk(upload.id, start, request.stream, length, hasher)
+        if written != length or hasher.hexdigest() != expected_checksum:
+            storage.rollback_chunk(upload.id, start)
+            db.session.rollback()
+            return jsonify({
+                "error": "Chunk checksum mismatch" if written == length else "Chunk was truncated",
+                "received_size": start
+            }), 400
+
+        upload.received_size = start + length
+
+        if upload.received_size == upload.total_size:
+            completing = True
+            previous_recording_url = interview.recording_url
+            extension = RECORDING_EXTENSIONS[upload.content_type]
+            upload.storage_key = f"interviews/{interview.id}/{upload.id}{extension}"
+            upload.status = 'completed'
+            upload.completed_at = datetime.utcnow()
+            interview.recording_url = url_for('recordings.download_recording', interview_id=interview.id)
+
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error writing recording chunk: {e}")
+        return jsonify({"error": f"Failed to store chunk: {str(e)}"}), 500
+
+    if completing:
+        # Storage is finalised only once the completed status is committed. If that
+        # fails, the upload is reopened before its last chunk so the client can resend it.
+        try:
+            storage.complete_upload(upload.id, upload.storage_key)
+        except Exception as e:
+            print(f"Error completing recording upload: {e}")
+            storage.rollback_chunk(upload.id, start)
+            upload.status = 'in_progress'
+            upload.received_size = start
+            upload.storage_key = None
+            upload.completed_at = None
+            interview.recording_url = previous_recording_url
+            db.session.commit()
+            return jsonify({"error": f"Failed to store recording: {str(e)}", "received_size": start}), 500
+
+    return _upload_response(upload)
+
+
+@recording_routes.route('/<int:interview_id>/recording/uploads/<upload_id>', methods=['DELETE'])
+@jwt_required()
+def abort_upload(interview_id, upload_id):
+    """Abort an in-progress upload and discard the received data"""
+    interview, error = _get_interview_for_user(interview_id)
+    if error:
+        return error
+
+    upload, error = _get_upload(interview.id, upload_id)
+    if error:
+        return error
+
+    if upload.status != 'in_progress':
+        return jsonify({"error": f"Upload is {upload.status}"}), 409
+
+    try:
+        get_recording_storage().abort_upload(upload.id)
+        upload.status = 'aborted'
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error aborting recording upload: {e}")
+        return jsonify({"error": f"Failed to abort upload: {str(e)}"}), 500
+
+    return _upload_response(upload)
+
+
+@recording_routes.route('/<int:interview_id>/recording', methods=['GET'])
+@jwt_required()
+def download_recording(interview_id):
+    """
+    Serve the interview recording.
+
+    Local files go through send_file, which handles the conditional and Range
+    headers. Its 206 body is a Python iterator that the server copies in small
+    reads, so a single-range response is given a file wrapper positioned at the
+    start of the range instead, which gunicorn sends with sendfile like a full
+    download. Remote backends redirect to their own download URL.
+    """
+    interview, error = _get_interview_for_user(interview_id, allow_employer=True)
+    if error:
+        return error
+
+    upload = (RecordingUpload.query
+              .filter_by(interview_id=interview.id, status='completed')
+              .order_by(RecordingUpload.completed_at.desc())
+              .first())
+    if not upload:
+        return jsonify({"error": "Recording not found"}), 404
+
+    storage = get_recording_storage()
+    path = storage.local_path(upload.storage_key)
+    if path:
+        response = send_file(
+            path,
+            mimetype=upload.content_type,
+            conditional=True,
+            etag=upload.id,
+            last_modified=upload.completed_at,
+            max_age=0
+        )
+        file_wrapper = request.environ.get('wsgi.file_wrapper')
+        if response.status_code == 206 and file_wrapper and 'X-Sendfile' not in response.headers:
+            content_range = response.content_range
+            response.close()
+            recording = open(path, 'rb')
+            recording.seek(content_range.start)
+            response.response = file_wrapper(_FileRange(recording, content_range.stop - content_range.start))
+        return response
+
+    download_url = storage.download_url(upload.storage_key)
+    if download_url:
+        return redirect(download_url)
+
+    return jsonify({"error": "Recording is not available for download"}), 404
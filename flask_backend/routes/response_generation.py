@@ -3,22 +3,22 @@
 AI response generation routes
 """
 
-from flask import Blueprint, request, jsonify
-from utils.openai_client import get_openai_client, is_api_key_configured
+import time
+from flask import Blueprint, request, jsonify, g
+from utils.tenant_clients import openai_client_required
+from utils.usage import record_usage
+from utils.model_router import get_model_router, InvalidRouteRequestError
+from utils.tracing import span
 
 # Create blueprint for response generation routes
 response_routes = Blueprint('response', __name__)
 
 @response_routes.route("/api/generate-response", methods=["POST"])
+@openai_client_required
 def generate_response():
     """Generate AI response using OpenAI GPT"""
     
-    if not is_api_key_configured():
-        return jsonify({"error": "OpenAI API key not configured"}), 401
-    
-    client = get_openai_client()
-    if not client:
-        return jsonify({"error": "OpenAI client initialization failed"}), 500
+    client = g.openai_client
     
     data = request.json
     
@@ -42,16 +42,37 @@ def generate_response():
         IMPORTANT: Don't repeat yourself. Never say "Thank you for sharing" or similar phrases repeatedly.
         """
         
+        # Pick model, token budget and timeout; clients may only lower the budget
+        router = get_model_router()
+        try:
+            route = router.choose(
+                "generate_response",
+                input_chars=len(system_prompt) + len(transcript),
+                requested_model=options.get("model"),
+                requested_max_tokens=options.get("maxTokens")
+            )
+        except InvalidRouteRequestError as e:
+            return jsonify({"error": str(e)}), 400
+        
         # Call OpenAI Chat Completions API
-        response = client.chat.completions.create(
-            model=options.get("model", "gpt-4o-mini"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": transcript}
-            ],
-            temperature=options.get("temperature", 0.7),
-            max_tokens=options.get("maxTokens", 250)
-        )
+        start = time.perf_counter()
+        try:
+            with span('openai.chat.completions', model=route.model, max_tokens=route.max_tokens, rule=route.rule):
+                response = client.chat.completions.create(
+                    model=route.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": transcript}
+                    ],
+                    temperature=options.get("temperature", 0.7),
+                    max_tokens=route.max_tokens,
+                    timeout=route.timeout_s
+                )
+        except Exception as e:
+            router.record(route, time.perf_counter() - start, error=e)
+            raise
+        router.record(route, time.perf_counter() - start, usage=response.usage)
+        record_usage(g.tenant_id, route.model, usage=response.usage)
         
         return jsonify({"response": response.choices[0].message.content})
     
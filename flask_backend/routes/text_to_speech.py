@@ -4,22 +4,20 @@ Text-to-speech conversion routes
 """
 
 import base64
-from flask import Blueprint, request, jsonify
-from utils.openai_client import get_openai_client, is_api_key_configured
+from flask import Blueprint, request, jsonify, g
+from utils.tenant_clients import openai_client_required
+from utils.usage import record_usage
+from utils.tracing import span
 
 # Create blueprint for TTS routes
 tts_routes = Blueprint('tts', __name__)
 
 @tts_routes.route("/api/text-to-speech", methods=["POST"])
+@openai_client_required
 def text_to_speech():
     """Convert text to speech using OpenAI TTS API"""
     
-    if not is_api_key_configured():
-        return jsonify({"error": "OpenAI API key not configured"}), 401
-    
-    client = get_openai_client()
-    if not client:
-        return jsonify({"error": "OpenAI client initialization failed"}), 500
+    client = g.openai_client
     
     data = request.json
     
@@ -31,15 +29,18 @@ def text_to_speech():
         options = data.get("options", {})
         
         # Call OpenAI TTS API with more natural-sounding voice
-        response = client.audio.speech.create(
-            model=options.get("model", "tts-1-hd"),
-            voice=options.get("voice", "nova"),  # Using nova for a more natural voice
-            input=text,
-            speed=options.get("speed", 1.0)
-        )
+        with span('openai.audio.speech', model=options.get("model", "tts-1-hd"), input_chars=len(text)):
+            response = client.audio.speech.create(
+                model=options.get("model", "tts-1-hd"),
+                voice=options.get("voice", "nova"),  # Using nova for a more natural voice
+                input=text,
+                speed=options.get("speed", 1.0)
+            )
+        record_usage(g.tenant_id, options.get("model", "tts-1-hd"), characters=len(text))
         
         # Convert audio to base64
-        audio_base64 = base64.b64encode(response.content).decode("utf-8")
+        with span('base64.encode', audio_bytes=len(response.content)):
+            audio_base64 = base64.b64encode(response.content).decode("utf-8")
         
         return jsonify({"audio_data": audio_base64})
     
@@ -5,22 +5,20 @@ Audio transcription routes
 
 import base64
 import io
-from flask import Blueprint, request, jsonify
-from utils.openai_client import get_openai_client, is_api_key_configured
+from flask import Blueprint, request, jsonify, g
+from utils.tenant_clients import openai_client_required
+from utils.usage import record_usage
+from utils.tracing import span
 
 # Create blueprint for transcription routes
 transcription_routes = Blueprint('transcription', __name__)
 
 @transcription_routes.route("/api/transcribe", methods=["POST"])
+@openai_client_required
 def transcribe_audio():
     """Transcribe audio using OpenAI Whisper API"""
     
-    if not is_api_key_configured():
-        return jsonify({"error": "OpenAI API key not configured"}), 401
-    
-    client = get_openai_client()
-    if not client:
-        return jsonify({"error": "OpenAI client initialization failed"}), 500
+    client = g.openai_client
     
     data = request.json
     
@@ -29,7 +27,8 @@ def transcribe_audio():
     
     try:
         # Decode base64 audio data
-        audio_bytes = base64.b64decode(data["audio_data"])
+        with span('base64.decode', encoded_chars=len(data["audio_data"])):
+            audio_bytes = base64.b64decode(data["audio_data"])
         
         # Create temporary file for OpenAI API
         audio_file = io.BytesIO(audio_bytes)
@@ -38,13 +37,16 @@ def transcribe_audio():
         options = data.get("options", {})
         
         # Call OpenAI Whisper API
-        response = client.audio.transcriptions.create(
-            file=audio_file,
-            model="whisper-1",
-            language=options.get("language"),
-            prompt=options.get("prompt"),
-            temperature=options.get("temperature", 0.2)
-        )
+        with span('openai.audio.transcriptions', model="whisper-1", audio_bytes=len(audio_bytes)):
+            response = client.audio.transcriptions.create(
+                file=audio_file,
+                model="whisper-1",
+                language=options.get("language"),
+                prompt=options.get("prompt"),
+                temperature=options.get("temperature", 0.2),
+                response_format="verbose_json" # Includes the audio duration, for usage accounting
+            )
+        record_usage(g.tenant_id, "whisper-1", audio_seconds=getattr(response, "duration", None) or 0.0)
         
         return jsonify({"text": response.text})
     
@@ -0,0 +1,85 @@
+"""
+Response compression
+
+Compresses JSON and text responses above a size threshold with brotli or gzip,
+whichever the client prefers in Accept-Encoding. Brotli is used only if the
+`brotli` package is installed. File downloads (send_file) and streamed
+responses are left alone.
+"""
+
+import gzip
+
+from flask import request, current_app
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+}
+
+
+def _supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """
+    Pick the best encoding we support from a parsed Accept-Encoding header.
+    Ties in quality prefer brotli. Returns None if nothing acceptable.
+    """
+    best, best_quality = None, 0
+    for encoding in _supported_encodings():
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(data, encoding, level):
+    if encoding == 'br':
+        # Brotli quality 0-11; map the gzip-style 1-9 level onto it
+        return brotli.compress(data, quality=min(11, max(0, level - 1)))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_response(response):
+    """after_request hook that compresses eligible responses in place"""
+    if (response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    response.set_data(compress_body(data, encoding, current_app.config['COMPRESS_LEVEL']))
+    response.headers['Content-Encoding'] = encoding
+    # A strong validator must change with the representation; weak ones may not
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def init_compression(app):
+    """Register the compression hook if enabled"""
+    if app.config.get('COMPRESS_RESPONSES', True):
+        app.after_request(compress_response)
@@ -0,0 +1,46 @@
+"""
+Conditional GET helpers
+
+Resources carry a weak ETag and a Last-Modified date derived from their
+timestamps. When the client's If-None-Match / If-Modified-Since still matches,
+a 304 is returned before the payload is built or serialized.
+"""
+
+import hashlib
+
+from flask import request, jsonify, current_app
+
+
+def make_etag(*parts):
+    """Builds an ETag value from the parts that identify a resource version"""
+    key = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP dates have one second resolution
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional_json(build_payload, etag, last_modified=None):
+    """
+    Returns a JSON response for `build_payload()`, or an empty 304 if the client's
+    cached copy is still current. `last_modified` is a naive UTC datetime.
+    """
+    if _not_modified(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build_payload())
+
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Cached copies belong to one user and must be revalidated before use
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
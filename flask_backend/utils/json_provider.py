@@ -0,0 +1,51 @@
+"""
+Fast JSON provider
+
+Plugs orjson into Flask's JSON provider hook so jsonify() and request.json use
+it. orjson is several times faster than the stdlib json module on the large
+interview payloads. If orjson is not installed the default provider is kept.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+from utils.tracing import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, falling back to Flask's encoder for unknown types"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys'):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        # DefaultJSONProvider.default handles dates, decimals, UUIDs and dataclasses
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        with span('json.decode', size=len(s)):
+            return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+        # Skip the bytes -> str -> bytes round trip of the base implementation
+        with span('json.encode') as current:
+            body = orjson.dumps(obj, default=self.default, option=option)
+            if current is not None:
+                current.set_attribute('size', len(body))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Install the orjson provider on the app if orjson is available"""
+    if orjson is not None and app.config.get('USE_ORJSON', True):
+        app.json = OrjsonProvider(app)
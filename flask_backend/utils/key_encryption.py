@@ -0,0 +1,50 @@
+"""
+Encryption of tenant API keys at rest
+
+Keys are encrypted with Fernet (AES-128-CBC + HMAC-SHA256). TENANT_KEY_ENCRYPTION_KEY
+holds one or more comma-separated Fernet keys (generate one with
+`python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`).
+The first key encrypts; all of them can decrypt, so a new key can be put in
+front and old ciphertexts keep working until they are re-encrypted.
+"""
+
+from flask import current_app
+
+try:
+    from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+except ImportError:  # pragma: no cover - optional dependency
+    Fernet = None
+
+
+class KeyEncryptionError(Exception):
+    """Tenant keys cannot be encrypted or decrypted with the current settings"""
+
+
+def _cipher():
+    app = current_app._get_current_object()
+    cipher = app.extensions.get('key_cipher')
+    if cipher is None:
+        if Fernet is None:
+            raise KeyEncryptionError("The cryptography package is required for tenant API keys.")
+        keys = [key.strip() for key in (app.config.get('TENANT_KEY_ENCRYPTION_KEY') or '').split(',') if key.strip()]
+        if not keys:
+            raise KeyEncryptionError("TENANT_KEY_ENCRYPTION_KEY is not configured.")
+        try:
+            cipher = MultiFernet([Fernet(key) for key in keys])
+        except ValueError as e:
+            raise KeyEncryptionError(f"Invalid TENANT_KEY_ENCRYPTION_KEY: {e}")
+        app.extensions['key_cipher'] = cipher
+    return cipher
+
+
+def encrypt_api_key(api_key: str) -> str:
+    """Encrypts an API key for storage"""
+    return _cipher().encrypt(api_key.encode('utf-8')).decode('ascii')
+
+
+def decrypt_api_key(token: str) -> str:
+    """Decrypts a stored API key"""
+    try:
+        return _cipher().decrypt(token.encode('ascii')).decode('utf-8')
+    except InvalidToken:
+        raise KeyEncryptionError("Stored API key cannot be decrypted with TENANT_KEY_ENCRYPTION_KEY.")
@@ -0,0 +1,221 @@
+"""
+Model and token-budget routing for OpenAI calls
+
+Every generation/analysis call asks the router which model, max_tokens and
+timeout to use. The choice comes from per-endpoint rules keyed on input size,
+and falls back to a cheaper "degraded" route while the observed upstream p95
+latency of the rule's model is above the endpoint's latency SLO. The routed
+model always wins over one named by the client, which must still be on the
+endpoint's allow-list.
+
+Rules can be overridden with a JSON file named by MODEL_ROUTING_CONFIG, with
+the same shape as DEFAULT_ROUTING. Each routed call is recorded (model, rule,
+latency, token usage) in a JSON-lines log and in per-process aggregates.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+
+from flask import current_app
+
+logger = logging.getLogger('model_routing')
+
+DEFAULT_ROUTING = {
+    "generate_response": {
+        "allowed_models": ["gpt-4o-mini", "gpt-4o"],
+        "latency_slo_ms": 3000,
+        # First rule whose max_input_chars covers the input wins; the last rule has no limit
+        "rules": [
+            {"name": "short", "max_input_chars": 2000, "model": "gpt-4o-mini", "max_tokens": 200, "timeout_s": 15},
+            {"name": "long", "model": "gpt-4o-mini", "max_tokens": 250, "timeout_s": 20},
+        ],
+        "degraded": {"name": "degraded", "model": "gpt-4o-mini", "max_tokens": 120, "timeout_s": 10},
+    },
+    "analyze_transcript": {
+        "allowed_models": ["gpt-4o-mini", "gpt-4o"],
+        "latency_slo_ms": 30000,
+        "rules": [
+            {"name": "short", "max_input_chars": 12000, "model": "gpt-4o-mini", "max_tokens": 600, "timeout_s": 60},
+            {"name": "long", "model": "gpt-4o-mini", "max_tokens": 800, "timeout_s": 90},
+        ],
+        "degraded": {"name": "degraded", "model": "gpt-4o-mini", "max_tokens": 500, "timeout_s": 45},
+    },
+}
+
+# Latency samples kept per model, and how many are needed before they are trusted
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+class InvalidRouteRequestError(ValueError):
+    """Raised when the client's routing options (model, maxTokens) are invalid."""
+
+
+class ModelNotAllowedError(InvalidRouteRequestError):
+    """Raised when a client asks for a model outside the endpoint's allow-list."""
+
+
+@dataclass
+class Route:
+    """The model, token budget and timeout chosen for one call"""
+    endpoint: str
+    model: str
+    max_tokens: int
+    timeout_s: float
+    rule: str
+    input_chars: int
+    reason: str
+
+
+class LatencyTracker:
+    """Rolling window of upstream call latencies per (endpoint, model)"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, endpoint, model, latency_s):
+        with self.lock:
+            self.samples.setdefault((endpoint, model), deque(maxlen=self.window)).append(latency_s)
+
+    def p95_ms(self, endpoint, model):
+        """Observed p95 in milliseconds, or None with too few samples"""
+        # Keyed by endpoint too: slow analysis calls must not degrade chat on the same model
+        with self.lock:
+            values = sorted(self.samples.get((endpoint, model), ()))
+        if len(values) < MIN_LATENCY_SAMPLES:
+            return None
+        return values[int(0.95 * (len(values) - 1))] * 1000
+
+
+class ModelRouter:
+    """Chooses routes from the routing rules and records their outcome"""
+
+    def __init__(self, routing, log_path=None):
+        self.routing = routing
+        self.latency = LatencyTracker()
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.log_path = log_path
+
+    def choose(self, endpoint, input_chars, requested_model=None, requested_max_tokens=None):
+        """
+        Returns the Route for a call. `requested_model` must be on the endpoint's
+        allow-list (ModelNotAllowedError otherwise) but does not replace the routed
+        model; `requested_max_tokens` must be a number (InvalidRouteRequestError
+        otherwise) and can only lower the rule's budget.
+        """
+        config = self.routing[endpoint]
+        if requested_model and requested_model not in config["allowed_models"]:
+            raise ModelNotAllowedError(f"Model not allowed: {requested_model}")
+        if requested_max_tokens:
+            try:
+                requested_max_tokens = int(requested_max_tokens)
+            except (TypeError, ValueError):
+                raise InvalidRouteRequestError(f"maxTokens must be a number, got {requested_max_tokens!r}")
+
+        rule = next(
+            rule for rule in config["rules"]
+            if rule.get("max_input_chars") is None or input_chars <= rule["max_input_chars"]
+        )
+        reason = "input_size"
+
+        observed_p95 = self.latency.p95_ms(endpoint, rule["model"])
+        degraded = config.get("degraded")
+        if degraded and observed_p95 is not None and observed_p95 > config["latency_slo_ms"]:
+            rule = degraded
+            reason = f"upstream_p95_{int(observed_p95)}ms_over_slo"
+
+        # The model checked against the SLO is the one called, and the one record() samples
+        model = rule["model"]
+        if requested_model and requested_model != model:
+            reason += "+client_model_overridden"
+
+        max_tokens = rule["max_tokens"]
+        if requested_max_tokens:
+            max_tokens = max(1, min(requested_max_tokens, max_tokens))
+
+        return Route(
+            endpoint=endpoint,
+            model=model,
+            max_tokens=max_tokens,
+            timeout_s=rule["timeout_s"],
+            rule=rule.get("name", "unnamed"),
+            input_chars=input_chars,
+            reason=reason,
+        )
+
+    def record(self, route, latency_s, usage=None, error=None):
+        """Records the outcome of a routed call"""
+        if error is None:
+            self.latency.add(route.endpoint, route.model, latency_s)
+
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+
+        key = (route.endpoint, route.model, route.rule)
+        with self.lock:
+            stats = self.stats.setdefault(key, {
+                "calls": 0, "errors": 0, "latency_s_total": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            stats["calls"] += 1
+            stats["errors"] += 1 if error is not None else 0
+            stats["latency_s_total"] += latency_s
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+
+        entry = {
+            **asdict(route),
+            "ts": time.time(),
+            "latency_ms": round(latency_s * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "error": str(error) if error is not None else None,
+        }
+        line = json.dumps(entry)
+        logger.info(line)
+        if self.log_path:
+            with self.lock, open(self.log_path, "a") as f:
+                f.write(line + "\n")
+
+    def summary(self):
+        """Per (endpoint, model, rule) aggregates for this process"""
+        with self.lock:
+            return [
+                {
+                    "endpoint": endpoint, "model": model, "rule": rule,
+                    "calls": stats["calls"], "errors": stats["errors"],
+                    "avg_latency_ms": round(stats["latency_s_total"] / stats["calls"] * 1000, 1),
+                    "prompt_tokens": stats["prompt_tokens"],
+                    "completion_tokens": stats["completion_tokens"],
+                }
+                for (endpoint, model, rule), stats in self.stats.items()
+            ]
+
+
+def load_routing(path=None):
+    """DEFAULT_ROUTING with endpoints replaced by those in the JSON file at `path`"""
+    routing = dict(DEFAULT_ROUTING)
+    if path:
+        with open(path) as f:
+            routing.update(json.load(f))
+    return routing
+
+
+def get_model_router() -> ModelRouter:
+    """Returns the model router for the current app"""
+    app = current_app._get_current_object()
+    router = app.extensions.get('model_router')
+    if router is None:
+        router = ModelRouter(
+            load_routing(app.config.get('MODEL_ROUTING_CONFIG')),
+            log_path=app.config.get('MODEL_ROUTING_LOG'),
+        )
+        app.extensions['model_router'] = router
+    return router
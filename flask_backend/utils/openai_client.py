@@ -1,82 +1,93 @@
-
 import os
-import openai
 import json
-from dotenv import load_dotenv
+import threading
+import time
+
+from utils.model_router import get_model_router
+from utils.tracing import span, traced
+from utils.usage import record_usage
+
+# The OpenAI SDK takes ~0.5s to import, so it is only imported when a client is
+# first needed (or up front by preload_sdk() in a preforking server's master).
+_UNSET = object()
+_api_key = _UNSET
+_client = None
+_client_lock = threading.Lock()
 
-load_dotenv()
+def _current_api_key():
+    """Returns the configured API key, reading OPENAI_API_KEY on first use."""
+    global _api_key
+    if _api_key is _UNSET:
+        _api_key = os.environ.get("OPENAI_API_KEY") or None
+        if not _api_key:
+            print("Warning: OPENAI_API_KEY not found in environment variables. OpenAI API calls will fail.")
+    return _api_key
 
-# Initialize the API key at the module level
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-if OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
-else:
-    print("Warning: OPENAI_API_KEY not found in environment variables. OpenAI API calls will fail.")
-    openai.api_key = None # Explicitly set to None if not found
+def preload_sdk():
+    """
+    Imports the OpenAI SDK eagerly. Called from the gunicorn master when the app
+    is preloaded so forked workers share the already imported modules.
+    """
+    import openai
+    return openai
 
 def is_api_key_configured() -> bool:
     """Checks if the OpenAI API key is configured."""
-    return bool(openai.api_key)
+    return bool(_current_api_key())
 
+@traced('openai.get_client')
 def get_openai_client():
     """
     Returns an initialized OpenAI client if the API key is configured.
-    Returns None otherwise.
+    Returns None otherwise. The client is created once and reused so its
+    connection pool is shared between requests.
     """
+    global _client
     if not is_api_key_configured():
         print("Error: OpenAI API key not configured. Cannot create client.")
         return None
-    return openai.OpenAI()
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                openai = preload_sdk()
+                _client = openai.OpenAI(api_key=_current_api_key())
+    return _client
 
 def set_api_key(api_key_value: str):
     """
     Sets the OpenAI API key and returns an initialized OpenAI client.
     Raises ValueError if the API key is empty.
     """
+    global _api_key, _client
     if not api_key_value:
-        # This case should ideally be caught by the route before calling this.
-        # However, adding a check here for robustness.
+        # The caller in auth.py immediately uses the returned client for a test
+        # request, so an empty key is rejected here rather than returning None.
         print("Error: Attempted to set an empty API key.")
-        # The route expects a client to be returned to make a test call,
-        # so returning None or raising an exception needs to be handled by the caller.
-        # For now, let's update the key and let the OpenAI client instantiation fail
-        # or the subsequent test call fail, which is more aligned with current error handling.
-        # Alternatively, we could raise an immediate error.
-        # For consistency with `get_openai_client` which can return None,
-        # let's consider what the caller in `auth.py` expects.
-        # The caller `client = set_api_key(...)` then `client.chat.completions.create`.
-        # So, it must return a client object.
         raise ValueError("API key cannot be empty.")
 
-    openai.api_key = api_key_value
-    # Optionally, update the global OPENAI_API_KEY if it's meant to be dynamically changed
-    # For now, just setting openai.api_key is the direct way the library uses it.
-    # global OPENAI_API_KEY
-    # OPENAI_API_KEY = api_key_value
-    
-    # The route expects this function to return a client instance
-    # so it can immediately test it.
-    return openai.OpenAI()
-
-def analyze_transcript_with_openai(transcript_text: str):
-    """
-    Analyzes an interview transcript using OpenAI GPT model.
-    Returns a dictionary with scores and justifications.
-    """
-    client = get_openai_client()
-    if not client:
-        # If client is None, it means API key is not configured.
-        # Return an error structure or raise an exception.
-        # For consistency with existing error handling in the function,
-        # let's craft an error response.
-        return {
-            "language_score": { "score": 0, "justification": "OpenAI API key not configured." },
-            "personality_score": { "score": 0, "justification": "OpenAI API key not configured." },
-            "accuracy_score": { "score": 0, "justification": "OpenAI API key not configured." },
-            "overall_summary": "Could not analyze transcript because OpenAI API key is not configured."
-        }
-
-    prompt = f"""
+    with _client_lock:
+        _api_key = api_key_value
+        _client = None
+    return get_openai_client()
+
+def verify_api_key(api_key_value: str):
+    """Makes a minimal request with the key; raises if the key does not work."""
+    client = preload_sdk().OpenAI(api_key=api_key_value)
+    client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": "Test"}],
+        max_tokens=5
+    )
+
+# Bump whenever the evaluation prompt changes, so stored scores can be re-scored
+# (flask interviews rescore) and traced back to the prompt that produced them.
+ANALYSIS_PROMPT_VERSION = "2025-05-v1"
+
+ANALYSIS_SYSTEM_MESSAGE = "You are an expert interview evaluator outputting JSON."
+
+def build_analysis_prompt(transcript_text: str) -> str:
+    """Builds the evaluation prompt for a transcript"""
+    return f"""
 You are an expert interview evaluator. Analyze the following interview transcript.
 The candidate was asked a series of questions by an AI Interviewer.
 Based *only* on the candidate's responses ("You: ...") in the transcript:
@@ -100,45 +111,99 @@ Transcript:
 ---
 Ensure the output is a single valid JSON object and nothing else.
 """
+
+def analysis_request_body(transcript_text: str, route) -> dict:
+    """Chat completion parameters for analysing a transcript with the given route"""
+    return {
+        "model": route.model,
+        "messages": [
+            {"role": "system", "content": ANALYSIS_SYSTEM_MESSAGE},
+            {"role": "user", "content": build_analysis_prompt(transcript_text)}
+        ],
+        "temperature": 0.5,
+        "max_tokens": route.max_tokens,
+        "response_format": {"type": "json_object"} # Request JSON output
+    }
+
+def parse_analysis_content(content) -> dict:
+    """
+    Parses the model's JSON reply.
+    Raises ValueError (json.JSONDecodeError for malformed JSON) if unusable.
+    """
+    if content is None:
+        raise ValueError("OpenAI returned an empty response.")
+    with span('json.decode', purpose='analysis'):
+        return json.loads(content)
+
+def request_transcript_analysis(transcript_text: str, client=None, tenant_id=None) -> dict:
+    """
+    Analyzes a transcript and returns the parsed result.
+    Unlike analyze_transcript_with_openai, errors are raised rather than turned
+    into placeholder scores, so bulk jobs can tell failures apart.
+    `client` defaults to the default-key client; pass a tenant's client and
+    `tenant_id` (see utils.tenant_clients.employer_openai_client) to use and
+    bill that tenant's key.
+    """
+    client = client or get_openai_client()
+    if not client:
+        raise ValueError("OpenAI API key not configured.")
+
+    router = get_model_router()
+    route = router.choose("analyze_transcript", input_chars=len(transcript_text))
+    start = time.perf_counter()
+    try:
+        with span('openai.chat.completions', model=route.model, max_tokens=route.max_tokens, purpose='analysis'):
+            response = client.chat.completions.create(
+                **analysis_request_body(transcript_text, route),
+                timeout=route.timeout_s
+            )
+    except Exception as e:
+        router.record(route, time.perf_counter() - start, error=e)
+        raise
+    router.record(route, time.perf_counter() - start, usage=response.usage)
+    record_usage(tenant_id, route.model, usage=response.usage)
+
+    content = response.choices[0].message.content
+    try:
+        return parse_analysis_content(content)
+    except json.JSONDecodeError:
+        print(f"Received content: {content}")
+        raise
+
+def failed_analysis(error) -> dict:
+    """
+    Zero-score placeholder stored when an analysis fails. It is saved without a
+    prompt version, so `flask interviews rescore` picks the interview up again.
+    """
+    if isinstance(error, json.JSONDecodeError):
+        justification, summary = "Error in analysis.", "Could not analyze transcript due to an error."
+    else:
+        justification = f"OpenAI API Error: {str(error)}"
+        summary = f"Could not analyze transcript due to an OpenAI API error: {str(error)}"
+    return {
+        "language_score": { "score": 0, "justification": justification },
+        "personality_score": { "score": 0, "justification": justification },
+        "accuracy_score": { "score": 0, "justification": justification },
+        "overall_summary": summary
+    }
+
+def analyze_transcript_with_openai(transcript_text: str, client=None, tenant_id=None):
+    """
+    Analyzes an interview transcript using OpenAI GPT model.
+    Returns a dictionary with scores and justifications, or the failed_analysis()
+    placeholder if the analysis fails.
+    """
+    if client is None and not is_api_key_configured():
+        return failed_analysis(ValueError("OpenAI API key not configured."))
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini", # Using a cost-effective and capable model
-            messages=[
-                {"role": "system", "content": "You are an expert interview evaluator outputting JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5,
-            response_format={"type": "json_object"} # Request JSON output
-        )
-        
-        analysis_result_str = response.choices[0].message.content
-        if analysis_result_str is None:
-            raise ValueError("OpenAI returned an empty response.")
-            
-        analysis_result = json.loads(analysis_result_str)
-        return analysis_result
-        
+        return request_transcript_analysis(transcript_text, client=client, tenant_id=tenant_id)
     except json.JSONDecodeError as e:
         print(f"Error decoding JSON from OpenAI: {e}")
-        print(f"Received content: {analysis_result_str}")
-        # Fallback or re-attempt logic could be added here
-        return { # Return default/error structure
-            "language_score": { "score": 0, "justification": "Error in analysis." },
-            "personality_score": { "score": 0, "justification": "Error in analysis." },
-            "accuracy_score": { "score": 0, "justification": "Error in analysis." },
-            "overall_summary": "Could not analyze transcript due to an error."
-        }
+        return failed_analysis(e)
     except Exception as e:
         print(f"Error analyzing transcript with OpenAI: {e}")
-        # Consider re-raising or returning a specific error structure
-        # If the client itself was None (e.g. API key issue not caught by get_openai_client initial check)
-        # this generic exception might catch it.
-        return {
-            "language_score": { "score": 0, "justification": f"OpenAI API Error: {str(e)}" },
-            "personality_score": { "score": 0, "justification": f"OpenAI API Error: {str(e)}" },
-            "accuracy_score": { "score": 0, "justification": f"OpenAI API Error: {str(e)}" },
-            "overall_summary": f"Could not analyze transcript due to an OpenAI API error: {str(e)}"
-        }
+        return failed_analysis(e)
 
 # Placeholder for other OpenAI client functions if they exist in this file
 # ... keep existing code (if any other functions are in this file)
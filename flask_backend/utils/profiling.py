@@ -0,0 +1,191 @@
+"""
+On-demand request profiling
+
+An admin can switch on profiling for a fraction of the requests to one route
+(see routes/admin.py). Two modes are supported:
+
+- "cprofile": deterministic profile of the request thread, written as a .prof
+  file (pstats format; open with snakeviz or convert with flameprof).
+- "stack": a sampling profiler that records the request thread's stack every
+  few milliseconds and writes collapsed stacks (.folded), ready for
+  flamegraph.pl or speedscope. Lower overhead, and includes time spent
+  waiting on the network.
+
+The switch is kept in a small JSON file so every worker process sees it.
+"""
+
+import cProfile
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+from flask import g, request
+
+PROFILE_MODES = ('cprofile', 'stack')
+
+
+class ProfilingSwitch:
+    """Profiling rules per route, shared between workers through a JSON file"""
+
+    def __init__(self, state_path, reload_interval_s=1.0):
+        self.state_path = state_path
+        self.reload_interval_s = reload_interval_s
+        self.lock = threading.Lock()
+        self._rules = {}
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def _load(self):
+        # Re-read the state file at most once per reload interval, and only if it changed
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval_s:
+            return
+        with self.lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.state_path).st_mtime
+            except FileNotFoundError:
+                self._rules, self._mtime = {}, None
+                return
+            if mtime != self._mtime:
+                with open(self.state_path) as f:
+                    self._rules = json.load(f)
+                self._mtime = mtime
+
+    def _save(self, rules):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(rules, f)
+        os.replace(tmp_path, self.state_path)
+        with self.lock:
+            self._rules, self._checked_at = rules, 0.0
+
+    def rules(self):
+        """Active (unexpired) rules by route"""
+        self._load()
+        now = time.time()
+        return {route: rule for route, rule in self._rules.items() if rule['expires_at'] > now}
+
+    def enable(self, route, rate, mode, duration_s, interval_ms):
+        rules = self.rules()
+        rules[route] = {
+            'rate': rate,
+            'mode': mode,
+            'interval_ms': interval_ms,
+            'expires_at': time.time() + duration_s,
+        }
+        self._save(rules)
+        return rules[route]
+
+    def disable(self, route=None):
+        rules = {} if route is None else {r: rule for r, rule in self.rules().items() if r != route}
+        self._save(rules)
+
+    def match(self, route):
+        """The rule for `route` if this request should be profiled, else None"""
+        rule = self.rules().get(route)
+        if rule and random.random() < rule['rate']:
+            return rule
+        return None
+
+
+class CProfileSession:
+    """cProfile of the current thread"""
+
+    extension = '.prof'
+
+    def __init__(self, rule):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self, path):
+        self.profile.disable()
+        self.profile.dump_stats(path)
+
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval and counts collapsed stacks"""
+
+    extension = '.folded'
+
+    def __init__(self, rule):
+        self.interval_s = rule['interval_ms'] / 1000
+        self.thread_id = threading.get_ident()
+        self.counts = {}
+        self.stop_event = threading.Event()
+        self.sampler = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self.sampler.start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            folded = ';'.join(reversed(stack))
+            self.counts[folded] = self.counts.get(folded, 0) + 1
+
+    def stop(self, path):
+        self.stop_event.set()
+        self.sampler.join()
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+SESSION_CLASSES = {'cprofile': CProfileSession, 'stack': StackSampler}
+
+
+def _profile_path(output_dir, route, extension, trace_id):
+    safe_route = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+    stamp = time.strftime('%Y%m%dT%H%M%S')
+    return os.path.join(output_dir, f"{safe_route}-{stamp}-{trace_id or os.urandom(4).hex()}{extension}")
+
+
+def init_profiling(app):
+    """Install the request hooks that start and stop profiling sessions"""
+    output_dir = app.config.get('PROFILE_OUTPUT_DIR') or os.path.join(app.instance_path, 'profiles')
+    switch = ProfilingSwitch(os.path.join(output_dir, 'profiling.json'))
+    app.extensions['profiling'] = {'switch': switch, 'output_dir': output_dir}
+
+    @app.before_request
+    def _start_profile():
+        if request.url_rule is None:
+            return
+        rule = switch.match(request.url_rule.rule)
+        if rule is None:
+            return
+        session = SESSION_CLASSES[rule['mode']](rule)
+        try:
+            session.start()
+        except ValueError as e:
+            # Python 3.12+ allows only one active cProfile per process
+            print(f"Skipping profile of {request.url_rule.rule}: {e}")
+            return
+        g.profile_session = (request.url_rule.rule, session)
+
+    @app.teardown_request
+    def _stop_profile(error=None):
+        profiled = g.pop('profile_session', None)
+        if profiled is None:
+            return
+        route, session = profiled
+        path = _profile_path(output_dir, route, session.extension, g.get('trace_id'))
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            session.stop(path)
+        except Exception as e:
+            print(f"Failed to write profile for {route}: {e}")
@@ -0,0 +1,151 @@
+"""
+Storage backends for interview recordings.
+
+Recordings are received in chunks and written straight to the backend, so a
+whole video never has to be held in memory. The default backend keeps files on
+local disk; any other backend can be plugged in through the
+RECORDING_STORAGE_BACKEND setting ("module.path:ClassName").
+"""
+
+import importlib
+import os
+from abc import ABC, abstractmethod
+
+from flask import current_app
+
+# Size of the blocks copied from the request stream to storage
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class RecordingStorage(ABC):
+    """
+    Interface every recording backend implements.
+
+    An upload is identified by an opaque upload key while it is in progress and
+    by a storage key once it has been completed.
+    """
+
+    @abstractmethod
+    def begin_upload(self, upload_key: str, total_size: int):
+        """Prepare storage for a new upload."""
+
+    @abstractmethod
+    def write_chunk(self, upload_key: str, offset: int, stream, length: int, hasher):
+        """
+        Copy `length` bytes from `stream` into the upload at `offset`, feeding
+        every block to `hasher`. Returns the number of bytes written.
+        """
+
+    @abstractmethod
+    def rollback_chunk(self, upload_key: str, offset: int):
+        """Discard everything written to the upload past `offset`."""
+
+    @abstractmethod
+    def complete_upload(self, upload_key: str, storage_key: str):
+        """Turn a fully received upload into a stored recording."""
+
+    @abstractmethod
+    def abort_upload(self, upload_key: str):
+        """Remove a partially received upload."""
+
+    def local_path(self, storage_key: str):
+        """
+        Returns a filesystem path for the recording if the backend keeps it on
+        local disk (so it can be served with sendfile), None otherwise.
+        """
+        return None
+
+    def download_url(self, storage_key: str):
+        """Returns a URL the client can fetch the recording from directly, if any."""
+        return None
+
+    @abstractmethod
+    def delete(self, storage_key: str):
+        """Remove a stored recording."""
+
+
+class LocalRecordingStorage(RecordingStorage):
+    """Stores recordings as plain files under a root directory."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = os.path.abspath(root_dir)
+        self.uploads_dir = os.path.join(self.root_dir, 'uploads')
+        os.makedirs(self.uploads_dir, exist_ok=True)
+
+    def _upload_path(self, upload_key: str) -> str:
+        return os.path.join(self.uploads_dir, f"{os.path.basename(upload_key)}.part")
+
+    def _recording_path(self, storage_key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root_dir, storage_key))
+        if not path.startswith(self.root_dir + os.sep):
+            raise ValueError(f"Invalid storage key: {storage_key}")
+        return path
+
+    def begin_upload(self, upload_key: str, total_size: int):
+        # Create an empty part file; chunks are written into it at their offsets
+        with open(self._upload_path(upload_key), 'wb'):
+            pass
+
+    def write_chunk(self, upload_key: str, offset: int, stream, length: int, hasher):
+        written = 0
+        with open(self._upload_path(upload_key), 'r+b') as part:
+            part.seek(offset)
+            while written < length:
+                block = stream.read(min(COPY_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                hasher.update(block)
+                part.write(block)
+                written += len(block)
+        return written
+
+    def rollback_chunk(self, upload_key: str, offset: int):
+        with open(self._upload_path(upload_key), 'r+b') as part:
+            part.truncate(offset)
+
+    def complete_upload(self, upload_key: str, storage_key: str):
+        destination = self._recording_path(storage_key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(self._upload_path(upload_key), destination)
+
+    def abort_upload(self, upload_key: str):
+        try:
+            os.remove(self._upload_path(upload_key))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, storage_key: str):
+        return self._recording_path(storage_key)
+
+    def delete(self, storage_key: str):
+        try:
+            os.remove(self._recording_path(storage_key))
+        except FileNotFoundError:
+            pass
+
+
+def _load_backend(spec: str, app):
+    """Instantiate a backend from a "module.path:ClassName" spec."""
+    module_name, _, class_name = spec.partition(':')
+    if not class_name:
+        raise ValueError(f"RECORDING_STORAGE_BACKEND must look like 'module:Class', got {spec!r}")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    # Subclassing is required so a backend missing a method fails here, not mid-upload
+    if not (isinstance(backend_class, type) and issubclass(backend_class, RecordingStorage)):
+        raise ValueError(f"{spec} must be a subclass of utils.recording_storage.RecordingStorage")
+    return backend_class(app.config)
+
+
+def get_recording_storage() -> RecordingStorage:
+    """Returns the recording storage backend configured for the current app."""
+    app = current_app._get_current_object()
+    storage = app.extensions.get('recording_storage')
+    if storage is None:
+        backend = app.config.get('RECORDING_STORAGE_BACKEND', 'local')
+        if backend == 'local':
+            root_dir = app.config.get('RECORDING_STORAGE_DIR') or os.path.join(app.instance_path, 'recordings')
+            storage = LocalRecordingStorage(root_dir)
+        else:
+            storage = _load_backend(backend, app)
+        app.extensions['recording_storage'] = storage
+    return storage
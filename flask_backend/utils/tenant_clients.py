@@ -0,0 +1,178 @@
+"""
+Per-tenant OpenAI clients
+
+An employer can store its own OpenAI API key (encrypted, see
+utils/key_encryption.py). Requests authenticated as that employer are then
+served with a client built from that key instead of the process-wide
+OPENAI_API_KEY. Each tenant has:
+
+- its own client, and so its own HTTP connection pool, kept in a bounded
+  LRU pool per worker;
+- a concurrency limit (Employer.openai_max_concurrency, else
+  TENANT_MAX_CONCURRENCY, and never more than the worker's threads minus one)
+  on calls in flight in this worker. A request over the limit gets a 429 at
+  once (or after TENANT_QUEUE_TIMEOUT_S, if set) instead of occupying a
+  thread while it waits, so one busy tenant cannot tie up every worker thread.
+
+Views decorated with @openai_client_required find the client in
+g.openai_client and the tenant (employer id, or None for the default key) in
+g.tenant_id.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, jsonify
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+
+from models import db, Employer
+from utils.key_encryption import decrypt_api_key, KeyEncryptionError
+from utils.openai_client import get_openai_client, is_api_key_configured, preload_sdk
+
+
+class TenantBusyError(Exception):
+    """The tenant already has its maximum number of OpenAI calls in flight"""
+
+
+class _TenantEntry:
+    __slots__ = ('client', 'semaphore', 'ciphertext', 'max_concurrency')
+
+    def __init__(self, client, ciphertext, max_concurrency):
+        self.client = client
+        self.ciphertext = ciphertext
+        self.max_concurrency = max_concurrency
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+
+
+class TenantClientPool:
+    """Clients and concurrency slots per employer, for one worker process"""
+
+    def __init__(self, max_clients=64, default_concurrency=2, acquire_timeout_s=0.0, worker_threads=4):
+        self.max_clients = max_clients
+        # Leave at least one thread of the worker for other tenants
+        self.concurrency_cap = max(1, worker_threads - 1)
+        self.default_concurrency = min(default_concurrency, self.concurrency_cap)
+        self.acquire_timeout_s = acquire_timeout_s
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def _entry(self, employer):
+        ciphertext = employer.openai_api_key_encrypted
+        max_concurrency = min(employer.openai_max_concurrency or self.default_concurrency, self.concurrency_cap)
+        with self.lock:
+            entry = self.entries.get(employer.id)
+            # A changed key or limit (possibly set through another worker) replaces the entry
+            if entry is not None and entry.ciphertext == ciphertext and entry.max_concurrency == max_concurrency:
+                self.entries.move_to_end(employer.id)
+                return entry
+
+        openai = preload_sdk()
+        client = openai.OpenAI(api_key=decrypt_api_key(ciphertext))
+        with self.lock:
+            entry = self.entries[employer.id] = _TenantEntry(client, ciphertext, max_concurrency)
+            self.entries.move_to_end(employer.id)
+            # Evicted clients are closed once in-flight calls drop their reference
+            while len(self.entries) > self.max_clients:
+                self.entries.popitem(last=False)
+        return entry
+
+    def acquire(self, employer, wait=False):
+        """
+        Takes one of the tenant's concurrency slots and returns (client, release).
+        Raises TenantBusyError if no slot is free (or frees up within the timeout).
+        With wait=True it blocks until a slot frees up, for background jobs.
+        """
+        entry = self._entry(employer)
+        if wait:
+            acquired = entry.semaphore.acquire()
+        elif self.acquire_timeout_s > 0:
+            acquired = entry.semaphore.acquire(timeout=self.acquire_timeout_s)
+        else:
+            acquired = entry.semaphore.acquire(blocking=False)
+        if not acquired:
+            raise TenantBusyError("Too many concurrent AI requests for this account; retry shortly.")
+        return entry.client, entry.semaphore.release
+
+    def evict(self, employer_id):
+        with self.lock:
+            self.entries.pop(employer_id, None)
+
+
+def init_tenant_clients(app):
+    """Create the app's tenant client pool"""
+    app.extensions['tenant_clients'] = TenantClientPool(
+        max_clients=app.config.get('TENANT_CLIENT_POOL_SIZE', 64),
+        default_concurrency=app.config.get('TENANT_MAX_CONCURRENCY', 2),
+        acquire_timeout_s=app.config.get('TENANT_QUEUE_TIMEOUT_S', 0.0),
+        worker_threads=app.config.get('WORKER_THREADS', 4),
+    )
+
+
+def get_tenant_clients() -> TenantClientPool:
+    return current_app.extensions['tenant_clients']
+
+
+def current_employer():
+    """The employer making the request (from an optional JWT), or None"""
+    verify_jwt_in_request(optional=True)
+    identity = get_jwt_identity()
+    if identity is None:
+        return None
+    return db.session.get(Employer, int(identity))
+
+
+@contextmanager
+def employer_openai_client(employer_id, wait=False):
+    """
+    Yields (client, tenant_id) for a call made on behalf of an employer, e.g.
+    analysing one of its interviews: its pooled client and id when it has a
+    key, else the default client and None. Raises TenantBusyError as acquire().
+    """
+    employer = db.session.get(Employer, employer_id) if employer_id is not None else None
+    if employer is None or employer.openai_api_key_encrypted is None:
+        yield get_openai_client(), None
+        return
+
+    client, release = get_tenant_clients().acquire(employer, wait=wait)
+    try:
+        yield client, employer_id
+    finally:
+        release()
+
+
+def openai_client_required(view):
+    """
+    Provide g.openai_client and g.tenant_id to the view: the tenant's pooled
+    client when the requesting employer has a key, else the default client.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        employer = current_employer()
+        if employer is None or employer.openai_api_key_encrypted is None:
+            if employer is not None:
+                db.session.rollback()  # Release the connection for the duration of the OpenAI call
+            if not is_api_key_configured():
+                return jsonify({"error": "OpenAI API key not configured"}), 401
+            g.openai_client, g.tenant_id = get_openai_client(), None
+            if not g.openai_client:
+                return jsonify({"error": "OpenAI client initialization failed"}), 500
+            return view(*args, **kwargs)
+
+        employer_id = employer.id
+        try:
+            client, release = get_tenant_clients().acquire(employer)
+        except TenantBusyError as e:
+            return jsonify({"error": str(e)}), 429
+        except KeyEncryptionError as e:
+            print(f"Tenant key error for employer {employer_id}: {e}")
+            return jsonify({"error": "OpenAI client initialization failed"}), 500
+        finally:
+            db.session.rollback()  # Release the connection for the duration of the OpenAI call
+        g.openai_client, g.tenant_id = client, employer_id
+        try:
+            return view(*args, **kwargs)
+        finally:
+            release()
+    return wrapper
@@ -0,0 +1,308 @@
+"""
+Lightweight request tracing
+
+Each request gets a trace id, returned in the X-Trace-Id header and taken from
+an incoming W3C `traceparent` header when present. For sampled requests, spans
+are recorded around the view function, OpenAI client creation and calls, SQL
+queries, and JSON/base64 encoding and decoding, then exported in OTLP/JSON form
+to a local JSON-lines file and/or an OTLP/HTTP collector.
+
+Spans are created with the `span()` context manager; it costs almost nothing
+when the current request is not sampled.
+"""
+
+import contextvars
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, request, has_request_context
+
+TRACE_HEADER = 'X-Trace-Id'
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+# Spans are stored per trace; None means the current context is not being traced
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+def _new_id(nbytes):
+    return os.urandom(nbytes).hex()
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'attributes', 'error')
+
+    def __init__(self, trace_id, parent_id, name, attributes):
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def to_otlp(self):
+        """OTLP/JSON representation of the span"""
+        data = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or time.time_ns()),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1},
+        }
+        if self.parent_id:
+            data['parentSpanId'] = self.parent_id
+        return data
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Trace:
+    """Collects the spans of one sampled request"""
+
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.spans = []
+
+    def start_span(self, name, parent_id, attributes):
+        span = Span(self.trace_id, parent_id, name, attributes)
+        self.spans.append(span)
+        return span
+
+
+@contextmanager
+def span(name, **attributes):
+    """Times the enclosed block as a child of the current span, if the request is traced"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = trace.start_span(name, parent.span_id if parent else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+def traced(name):
+    """Decorator form of span()"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace_id():
+    """Trace id of the current request, or None outside a request"""
+    return g.get('trace_id') if has_request_context() else None
+
+
+class SpanExporter:
+    """
+    Exports finished traces from a background thread so requests never wait on
+    I/O. Traces are dropped (and counted) if the queue is full.
+    """
+
+    def __init__(self, file_path=None, otlp_endpoint=None, service_name='interview-backend',
+                 max_queue=1000, batch_size=50, flush_interval_s=2.0):
+        self.file_path = file_path
+        self.otlp_endpoint = otlp_endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def export(self, trace):
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self):
+        # Started lazily so a preforking server starts one per worker, after the fork
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(target=self._run, name='span-exporter', daemon=True)
+                    self.thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                print(f"Trace export failed: {e}")
+
+    def _payload(self, traces):
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'flask_backend.tracing'},
+                    'spans': [s.to_otlp() for trace in traces for s in trace.spans],
+                }],
+            }]
+        }
+
+    def _write(self, traces):
+        payload = self._payload(traces)
+        if self.file_path:
+            with open(self.file_path, 'a') as f:
+                f.write(json.dumps(payload) + '\n')
+        if self.otlp_endpoint:
+            req = urllib.request.Request(
+                self.otlp_endpoint,
+                data=json.dumps(payload).encode('utf-8'),
+                headers={'Content-Type': 'application/json'},
+                method='POST',
+            )
+            urllib.request.urlopen(req, timeout=5).close()
+
+
+def _register_db_spans():
+    """Time every SQL statement as a db.query span"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if getattr(_register_db_spans, 'done', False):
+        return
+    _register_db_spans.done = True
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current_trace.get() is None:
+            return
+        cm = span('db.query', statement=statement[:500], executemany=executemany)
+        cm.__enter__()
+        conn.info.setdefault('trace_spans', []).append(cm)
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get('trace_spans')
+        if spans:
+            spans.pop().__exit__(None, None, None)
+
+    @event.listens_for(Engine, 'handle_error')
+    def _error(exception_context):
+        spans = exception_context.connection.info.get('trace_spans') if exception_context.connection else None
+        if spans:
+            error = exception_context.original_exception
+            spans.pop().__exit__(type(error), error, None)
+
+
+def _wrap_view(endpoint, view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with span('handler', endpoint=endpoint):
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def init_tracing(app):
+    """Install request hooks, DB spans and view spans. Call after registering blueprints."""
+    exporter = None
+    if app.config.get('TRACE_EXPORT_FILE') or app.config.get('TRACE_OTLP_ENDPOINT'):
+        exporter = SpanExporter(
+            file_path=app.config.get('TRACE_EXPORT_FILE'),
+            otlp_endpoint=app.config.get('TRACE_OTLP_ENDPOINT'),
+            service_name=app.config.get('TRACE_SERVICE_NAME', 'interview-backend'),
+        )
+    app.extensions['span_exporter'] = exporter
+    sample_rate = app.config.get('TRACE_SAMPLE_RATE', 0.0) if exporter else 0.0
+
+    if exporter:
+        _register_db_spans()
+        for endpoint, view in list(app.view_functions.items()):
+            app.view_functions[endpoint] = _wrap_view(endpoint, view)
+
+    @app.before_request
+    def _start_trace():
+        match = TRACEPARENT_RE.match(request.headers.get('traceparent', ''))
+        if match:
+            g.trace_id, parent_id, flags = match.groups()
+            sampled = bool(int(flags, 16) & 1) and exporter is not None
+        else:
+            g.trace_id, parent_id = _new_id(16), None
+            sampled = random.random() < sample_rate
+
+        if not sampled:
+            return
+
+        trace = Trace(g.trace_id)
+        route = request.url_rule.rule if request.url_rule else request.path
+        root = trace.start_span(f"{request.method} {route}", parent_id,
+                                {'http.method': request.method, 'http.target': request.path})
+        g.trace_root = root
+        g.trace_tokens = (_current_trace.set(trace), _current_span.set(root))
+
+    @app.after_request
+    def _add_trace_header(response):
+        if g.get('trace_id'):
+            response.headers[TRACE_HEADER] = g.trace_id
+        root = g.get('trace_root')
+        if root is not None:
+            root.set_attribute('http.status_code', response.status_code)
+        return response
+
+    @app.teardown_request
+    def _finish_trace(error=None):
+        root = g.pop('trace_root', None)
+        if root is None:
+            return
+        root.end_ns = time.time_ns()
+        if error is not None:
+            root.error = f"{type(error).__name__}: {error}"
+        trace = _current_trace.get()
+        for token in reversed(g.pop('trace_tokens', ())):
+            token.var.reset(token)
+        if trace is not None:
+            exporter.export(trace)
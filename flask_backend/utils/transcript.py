@@ -0,0 +1,108 @@
+"""
+Transcript parsing
+
+The frontend sends a transcript as blocks of "Speaker (timestamp): text"
+separated by blank lines; older transcripts use "You: ..." / "AI Interviewer: ..."
+without timestamps. parse_transcript() splits either form into turns, the rows
+of the interview_turns table. transcript_text stays the source of truth: each
+turn records its offsets into it, and the turns are never turned back into text.
+"""
+
+import re
+from datetime import datetime, timezone
+
+# A turn starts at the beginning of a line with a speaker label, an optional
+# "(timestamp)" and ": ". ISO timestamps contain colons, so the label may not.
+TURN_START_RE = re.compile(r'^(?P<speaker>[^\n:]{1,60}?)(?: \((?P<label>[^()\n]{1,40})\))?: ', re.MULTILINE)
+ELAPSED_RE = re.compile(r'^(?:(\d+):)?(\d{1,2}):(\d{2})$')
+
+INTERVIEWER_SPEAKERS = {'ai interviewer', 'interviewer'}
+CANDIDATE_SPEAKERS = {'you', 'candidate'}
+SYSTEM_SPEAKERS = {'system', 'complete interview transcript'}
+
+
+def speaker_role(speaker):
+    """'interviewer', 'candidate' or 'system' for a speaker label"""
+    name = (speaker or '').lower()
+    if name in INTERVIEWER_SPEAKERS:
+        return 'interviewer'
+    # Live transcription labels look like "You (Transcribed)"
+    if name in CANDIDATE_SPEAKERS or name.split(' (')[0] in CANDIDATE_SPEAKERS:
+        return 'candidate'
+    return 'system'
+
+
+def _is_turn_start(match):
+    # Without a timestamp only known speakers count, so "Note: ..." inside an answer stays text
+    if match.group('label'):
+        return True
+    speaker = match.group('speaker').lower()
+    return speaker in INTERVIEWER_SPEAKERS | CANDIDATE_SPEAKERS | SYSTEM_SPEAKERS
+
+
+def _parse_timestamp(label):
+    """Returns (spoken_at, elapsed_s) from a timestamp label; either may be None"""
+    if not label:
+        return None, None
+    match = ELAPSED_RE.match(label)
+    if match:
+        hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return None, float(hours * 3600 + minutes * 60 + seconds)
+    try:
+        spoken_at = datetime.fromisoformat(label)
+    except ValueError:
+        return None, None
+    if spoken_at.tzinfo is not None:
+        spoken_at = spoken_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return spoken_at, None
+
+
+def parse_transcript(transcript_text):
+    """
+    Splits a transcript into turn dicts with the InterviewTurn columns
+    (except interview_id). start_offset/end_offset delimit each turn's text
+    within transcript_text. question_index counts interviewer turns, so a
+    question and the answers that follow it share an index.
+    """
+    if not transcript_text:
+        return []
+
+    starts = [match for match in TURN_START_RE.finditer(transcript_text) if _is_turn_start(match)]
+    if not starts or transcript_text[:starts[0].start()].strip():
+        # Text before the first speaker label is kept as an unattributed turn
+        end = starts[0].start() if starts else len(transcript_text)
+        segments = [(None, None, 0, end)]
+    else:
+        segments = []
+    for i, match in enumerate(starts):
+        end = starts[i + 1].start() if i + 1 < len(starts) else len(transcript_text)
+        segments.append((match.group('speaker'), match.group('label'), match.end(), end))
+
+    turns = []
+    question_index = -1
+    first_spoken_at = None
+    for position, (speaker, label, start, end) in enumerate(segments):
+        text = transcript_text[start:end].rstrip()
+        role = speaker_role(speaker) if speaker is not None else 'system'
+        if role == 'interviewer':
+            question_index += 1
+
+        spoken_at, elapsed_s = _parse_timestamp(label)
+        if spoken_at is not None:
+            first_spoken_at = first_spoken_at or spoken_at
+            elapsed_s = (spoken_at - first_spoken_at).total_seconds()
+
+        turns.append({
+            'position': position,
+            'speaker': speaker,
+            'role': role,
+            'question_index': max(question_index, 0),
+            'start_offset': start,
+            'end_offset': start + len(text),
+            'text': text,
+            'timestamp_label': label,
+            'spoken_at': spoken_at,
+            'elapsed_s': elapsed_s,
+        })
+    return turns
+
@@ -0,0 +1,131 @@
+"""
+Per-tenant usage accounting
+
+Each OpenAI call made with a tenant's key adds its token counts, audio
+seconds or text-to-speech characters to an in-memory total keyed by
+(employer, UTC day, model). A background thread flushes the totals to the
+tenant_usage table every USAGE_FLUSH_INTERVAL_S seconds, so a request never
+waits on an accounting write and a burst of calls becomes one small batch of
+UPDATEs.
+"""
+
+import atexit
+import threading
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from models import db, TenantUsage
+
+COUNTERS = ('requests', 'prompt_tokens', 'completion_tokens', 'audio_seconds', 'characters')
+
+
+class UsageAccumulator:
+    """Aggregates usage in memory and writes it to the database in batches"""
+
+    def __init__(self, app, flush_interval_s=15.0):
+        self.app = app
+        self.flush_interval_s = flush_interval_s
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.pending = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def record(self, employer_id, model, prompt_tokens=0, completion_tokens=0, audio_seconds=0.0, characters=0):
+        key = (employer_id, datetime.utcnow().date(), model)
+        with self.lock:
+            totals = self.pending.get(key)
+            if totals is None:
+                totals = self.pending[key] = dict.fromkeys(COUNTERS, 0)
+            totals['requests'] += 1
+            totals['prompt_tokens'] += prompt_tokens or 0
+            totals['completion_tokens'] += completion_tokens or 0
+            totals['audio_seconds'] += audio_seconds or 0.0
+            totals['characters'] += characters or 0
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        # Started lazily so a preforking server starts one per worker, after the fork
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(target=self._run, name='usage-flusher', daemon=True)
+                    self.thread.start()
+                    atexit.register(self.flush)
+
+    def _run(self):
+        while not self.stop_event.wait(self.flush_interval_s):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Usage flush failed: {e}")
+
+    def flush(self):
+        """Writes the pending totals. On failure they are kept for the next flush."""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+            if not batch:
+                return
+            try:
+                with self.app.app_context():
+                    self._write(batch)
+            except Exception:
+                self._merge_back(batch)
+                raise
+
+    def _merge_back(self, batch):
+        with self.lock:
+            for key, totals in batch.items():
+                current = self.pending.setdefault(key, dict.fromkeys(COUNTERS, 0))
+                for counter in COUNTERS:
+                    current[counter] += totals[counter]
+
+    def _write(self, batch):
+        # Increment existing rows, insert the missing ones. If another worker
+        # inserts the same row first, the retry turns the insert into an update.
+        for attempt in range(2):
+            try:
+                for (employer_id, day, model), totals in batch.items():
+                    result = db.session.execute(
+                        update(TenantUsage)
+                        .where(TenantUsage.employer_id == employer_id, TenantUsage.day == day, TenantUsage.model == model)
+                        .values(updated_at=datetime.utcnow(),
+                                **{counter: getattr(TenantUsage, counter) + totals[counter] for counter in COUNTERS})
+                    )
+                    if result.rowcount == 0:
+                        db.session.add(TenantUsage(employer_id=employer_id, day=day, model=model, **totals))
+                db.session.commit()
+                return
+            except IntegrityError:
+                db.session.rollback()
+                if attempt:
+                    raise
+            finally:
+                db.session.remove()
+
+
+def init_usage(app):
+    """Create the app's usage accumulator"""
+    app.extensions['usage'] = UsageAccumulator(app, flush_interval_s=app.config.get('USAGE_FLUSH_INTERVAL_S', 15.0))
+
+
+def record_usage(employer_id, model, usage=None, audio_seconds=0.0, characters=0):
+    """
+    Adds one call to a tenant's usage. `usage` is the usage object of a chat
+    completion response, if any. Calls made with the default key (no tenant)
+    are not recorded.
+    """
+    if employer_id is None:
+        return
+    current_app.extensions['usage'].record(
+        employer_id,
+        model,
+        prompt_tokens=getattr(usage, 'prompt_tokens', 0),
+        completion_tokens=getattr(usage, 'completion_tokens', 0),
+        audio_seconds=audio_seconds,
+        characters=characters
+    )
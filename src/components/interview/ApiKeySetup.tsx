@@ -1,107 +0,0 @@
-
-import React, { useState } from "react";
-import { useNavigate } from "react-router-dom";
-import { Button } from "@/components/ui/button";
-import { Input } from "@/components/ui/input";
-import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
-import { toast } from "@/hooks/use-toast";
-import { backendService } from "@/services/api/BackendService";
-
-interface ApiKeySetupProps {
-  onSuccess: () => void;
-}
-
-export function ApiKeySetup({ onSuccess }: ApiKeySetupProps) {
-  const [apiKey, setApiKey] = useState("");
-  const [isLoading, setIsLoading] = useState(false);
-  const navigate = useNavigate();
-  
-  const handleSubmit = async (e: React.FormEvent) => {
-    e.preventDefault();
-    
-    if (!apiKey.trim()) {
-      toast({
-        title: "API key required",
-        description: "Please enter your OpenAI API key",
-        variant: "destructive",
-      });
-      return;
-    }
-    
-    setIsLoading(true);
-    
-    try {
-      // Send API key to backend
-      await fetch("/api/set-api-key", {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({ api_key: apiKey }),
-      });
-      
-      // On success
-      toast({
-        title: "API key saved",
-        description: "Your OpenAI API key has been saved and verified",
-      });
-      
-      // Trigger success callback
-      onSuccess();
-      
-    } catch (error) {
-      console.error("Error setting API key:", error);
-      toast({
-        title: "Error",
-        description: "Failed to set API key. Please try again.",
-        variant: "destructive",
-      });
-    } finally {
-      setIsLoading(false);
-    }
-  };
-  
-  return (
-    <Card className="w-full max-w-md mx-auto">
-      <CardHeader>
-        <CardTitle>OpenAI API Key Required</CardTitle>
-        <CardDescription>
-          To use the AI interview features, please provide your OpenAI API key.
-          This key will be stored on the Flask backend and not exposed to the client.
-        </CardDescription>
-      </CardHeader>
-      <form onSubmit={handleSubmit}>
-        <CardContent>
-          <div className="space-y-4">
-            <div className="space-y-2">
-              <Input
-                id="apiKey"
-                placeholder="sk-..."
-                value={apiKey}
-                onChange={(e) => setApiKey(e.target.value)}
-                required
-                className="w-full"
-                type="password"
-              />
-              <p className="text-sm text-muted-foreground">
-                Your API key will only be used for this interview session.
-              </p>
-            </div>
-          </div>
-        </CardContent>
-        <CardFooter className="flex justify-between">
-          <Button 
-            variant="outline" 
-            onClick={() => navigate("/candidate/dashboard")}
-            disabled={isLoading}
-          >
-            Cancel
-          </Button>
-          <Button type="submit" disabled={isLoading}>
-            {isLoading ? "Saving..." : "Save API Key"}
-          </Button>
-        </CardFooter>
-      </form>
-    </Card>
-  );
-}
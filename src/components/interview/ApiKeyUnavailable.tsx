@@ -0,0 +1,36 @@
+
+import React from "react";
+import { useNavigate } from "react-router-dom";
+import { Button } from "@/components/ui/button";
+import { Card, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
+
+interface ApiKeyUnavailableProps {
+  onRetry: () => void;
+}
+
+export function ApiKeyUnavailable({ onRetry }: ApiKeyUnavailableProps) {
+  const navigate = useNavigate();
+
+  return (
+    <Card className="w-full max-w-md mx-auto">
+      <CardHeader>
+        <CardTitle>AI Interviewer Unavailable</CardTitle>
+        <CardDescription>
+          The server has no OpenAI API key configured, so the AI interview features cannot run.
+          Please ask the administrator to configure one, then check again.
+        </CardDescription>
+      </CardHeader>
+      <CardFooter className="flex justify-between">
+        <Button
+          variant="outline"
+          onClick={() => navigate("/candidate/dashboard")}
+        >
+          Back to Dashboard
+        </Button>
+        <Button onClick={onRetry}>
+          Check Again
+        </Button>
+      </CardFooter>
+    </Card>
+  );
+}
@@ -10,7 +10,7 @@ import { useInterview } from "@/hooks/useInterview";
 import { Card, CardContent } from "@/components/ui/card";
 import EnhancedBackground from "@/components/EnhancedBackground";
 import { ThemeToggle } from "@/components/ThemeToggle";
-import { ApiKeySetup } from "@/components/interview/ApiKeySetup";
+import { ApiKeyUnavailable } from "@/components/interview/ApiKeyUnavailable";
 import type { TranscriptItem } from "@/types/interview"; 
 import type { Transcript } from "@/types/transcript"; // To properly type the state
 import { backendService } from "@/services/api/BackendService"; // Added this import
@@ -48,20 +48,20 @@ const InterviewPage = () => {
 
   const [lastTranscribed, setLastTranscribed] = useState("");
 
-  useEffect(() => {
-    const checkBackendStatus = async () => {
-      try {
-        // Using backendService instance now
-        const health = await backendService.healthCheck();
-        setBackendReady(health.status === "ok");
-        setApiKeyConfigured(health.api_key_configured || false);
-      } catch (error) {
-        console.error("Backend connection error:", error);
-        setBackendReady(false);
-        setApiKeyConfigured(false);
-      }
-    };
+  const checkBackendStatus = async () => {
+    try {
+      // Using backendService instance now
+      const health = await backendService.healthCheck();
+      setBackendReady(health.status === "ok");
+      setApiKeyConfigured(health.api_key_configured || false);
+    } catch (error) {
+      console.error("Backend connection error:", error);
+      setBackendReady(false);
+      setApiKeyConfigured(false);
+    }
+  };
 
+  useEffect(() => {
     checkBackendStatus();
   }, []);
 
@@ -74,10 +74,6 @@ const InterviewPage = () => {
     }
   }, [transcript]);
 
-  const handleApiKeySuccess = () => {
-    setApiKeyConfigured(true);
-  };
-
   const handleStartInterview = async () => {
     if (!mediaStream) {
       if (requestMediaPermissions) {
@@ -145,7 +141,7 @@ const InterviewPage = () => {
     return (
       <EnhancedBackground intensity="light" variant="default">
         <div className="flex flex-col min-h-screen p-4 justify-center items-center">
-          <ApiKeySetup onSuccess={handleApiKeySuccess} />
+          <ApiKeyUnavailable onRetry={checkBackendStatus} />
         </div>
       </EnhancedBackground>
     );